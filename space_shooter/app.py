@@ -1,15 +1,46 @@
-from flask import Flask, render_template, send_from_directory
+from flask import Flask, abort, request
 import os
 
-app = Flask(__name__)
+from build_client import load_manifest
+from page_cache import RenderedPage
+from static_assets import StaticAssets
+from tracing import trace_from_environment, traced
+
+# Static files are served by send_static below, not Flask's built-in route
+app = Flask(__name__, static_folder=None)
+
+# SPACE_SHOOTER_TRACE=trace-{pid}.json records request spans per worker
+trace_from_environment()
+
+# Hashed client bundles written by build_client.py; empty if it has not run
+static_dir = os.path.join(app.root_path, 'static')
+asset_manifest = load_manifest(static_dir)
+
+# Read, hash and compress static/ once, before gunicorn forks its workers
+static_assets = StaticAssets(static_dir, immutable=asset_manifest.values())
+app.jinja_env.globals['static_url'] = static_assets.url
+
+@app.template_global()
+def asset_url(path):
+    """URL of the built bundle for path, or of the source file in unbuilt checkouts."""
+    built = asset_manifest.get(path)
+    return f"/static/{built}" if built else static_assets.url(path)
+
+# The index page does not vary per request; render it once per template change
+index_page = RenderedPage(app, 'index.html')
 
 @app.route('/')
+@traced(cat="http")
 def index():
-    return render_template('index.html')
+    return index_page.response(request)
 
 @app.route('/static/<path:path>')
+@traced(cat="http")
 def send_static(path):
-    return send_from_directory('static', path)
+    response = static_assets.response(path, request)
+    if response is None:
+        abort(404)
+    return response
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)))
\ No newline at end of file
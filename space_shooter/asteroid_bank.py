@@ -0,0 +1,191 @@
+"""Pre-generated bank of procedural asteroid shapes.
+
+Drawing a random polygon and craters for every new asteroid makes level
+starts and splits spiky. The bank draws a fixed number of variants per
+size class once, from a seeded RNG, and asteroids pick one of them. The
+bank can be saved to disk so later launches skip generation.
+"""
+import json
+import math
+import os
+import random
+import struct
+import zlib
+
+import pygame
+
+# Radius range for each size category: 3 = large, 2 = medium, 1 = small
+RADIUS_RANGES = {3: (35, 45), 2: (20, 30), 1: (10, 15)}
+
+ASTEROID_COLOR = (150, 150, 150)  # Grey
+CRATER_COLOR = (100, 100, 100)  # Darker grey
+
+# File layout: magic, header length, JSON header, zlib-compressed RGBA pixels
+BANK_MAGIC = b"ASTBANK1"
+BANK_FORMAT_VERSION = 1
+
+
+def random_asteroid_shape(radius, rng=random):
+    """Return (polygon points, craters) for an asteroid of this radius."""
+    size = radius * 2
+
+    # Irregular outline
+    num_points = rng.randint(8, 12)
+    points = []
+    for i in range(num_points):
+        angle = 2 * math.pi * i / num_points
+        distance = radius * rng.uniform(0.8, 1.2)
+        point_x = radius + math.cos(angle) * distance
+        point_y = radius + math.sin(angle) * distance
+        points.append((point_x, point_y))
+
+    # Craters as (x, y, radius)
+    craters = []
+    num_craters = rng.randint(2, 5)
+    for _ in range(num_craters):
+        crater_x = rng.randint(int(size * 0.2), int(size * 0.8))
+        crater_y = rng.randint(int(size * 0.2), int(size * 0.8))
+        crater_radius = rng.randint(int(size * 0.05), int(size * 0.15))
+        craters.append((crater_x, crater_y, crater_radius))
+
+    return points, craters
+
+
+def draw_asteroid_shape(radius, points, craters):
+    """Draw an asteroid outline and craters onto a new surface."""
+    size = radius * 2
+    surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.polygon(surface, ASTEROID_COLOR, points)
+    for crater_x, crater_y, crater_radius in craters:
+        pygame.draw.circle(surface, CRATER_COLOR, (crater_x, crater_y), crater_radius)
+    return surface
+
+
+def convert_for_display(surface):
+    # Converted surfaces blit faster, but need an open window
+    if pygame.display.get_surface() is not None:
+        return surface.convert_alpha()
+    return surface
+
+
+class AsteroidVariant:
+    def __init__(self, variant_id, size, radius, points, craters, image):
+        self.variant_id = variant_id
+        self.size = size
+        self.radius = radius
+        self.points = points
+        self.craters = craters
+        self.image = image
+
+
+class AsteroidBank:
+    def __init__(self, variants_per_size=8, seed=0):
+        self.variants_per_size = variants_per_size
+        self.seed = seed
+
+        # Flat list indexed by variant id, plus ids grouped by size
+        self.variants = []
+        self.ids_by_size = {size: [] for size in RADIUS_RANGES}
+
+    @classmethod
+    def generate(cls, variants_per_size=8, seed=0):
+        """Draw every variant from a seeded RNG."""
+        bank = cls(variants_per_size, seed)
+        rng = random.Random(seed)
+        for size in sorted(RADIUS_RANGES):
+            low, high = RADIUS_RANGES[size]
+            for _ in range(variants_per_size):
+                radius = rng.randint(low, high)
+                points, craters = random_asteroid_shape(radius, rng)
+                image = draw_asteroid_shape(radius, points, craters)
+                bank.add(size, radius, points, craters, image)
+        return bank
+
+    def add(self, size, radius, points, craters, image, convert=True):
+        # Atlas frames are subsurfaces of an already converted sheet; keep them shared
+        if convert:
+            image = convert_for_display(image)
+        variant = AsteroidVariant(len(self.variants), size, radius, points, craters, image)
+        self.variants.append(variant)
+        self.ids_by_size[size].append(variant.variant_id)
+        return variant
+
+    def pick(self, size, rng=random):
+        """Return a random variant of the given size class."""
+        ids = self.ids_by_size[size]
+        return self.variants[ids[rng.randrange(len(ids))]]
+
+    def get(self, variant_id):
+        return self.variants[variant_id]
+
+    def __len__(self):
+        return len(self.variants)
+
+    def save(self, path):
+        """Write geometry and pixels so a later launch can skip generation."""
+        header = {
+            "version": BANK_FORMAT_VERSION,
+            "variants_per_size": self.variants_per_size,
+            "seed": self.seed,
+            "variants": [],
+        }
+        pixels = []
+        for variant in self.variants:
+            header["variants"].append({
+                "size": variant.size,
+                "radius": variant.radius,
+                "points": variant.points,
+                "craters": variant.craters,
+            })
+            pixels.append(pygame.image.tobytes(variant.image, "RGBA"))
+
+        header_bytes = json.dumps(header).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(BANK_MAGIC)
+            f.write(struct.pack("<I", len(header_bytes)))
+            f.write(header_bytes)
+            f.write(zlib.compress(b"".join(pixels)))
+
+    @classmethod
+    def load(cls, path):
+        """Read a bank written by save()."""
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(BANK_MAGIC):
+            raise ValueError(f"Not an asteroid bank file: {path}")
+
+        offset = len(BANK_MAGIC)
+        (header_length,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        header = json.loads(data[offset:offset + header_length].decode("utf-8"))
+        if header["version"] != BANK_FORMAT_VERSION:
+            raise ValueError(f"Unsupported asteroid bank version: {header['version']}")
+        pixels = zlib.decompress(data[offset + header_length:])
+
+        bank = cls(header["variants_per_size"], header["seed"])
+        position = 0
+        for entry in header["variants"]:
+            radius = entry["radius"]
+            length = (radius * 2) * (radius * 2) * 4
+            image = pygame.image.frombytes(pixels[position:position + length],
+                                           (radius * 2, radius * 2), "RGBA")
+            position += length
+            points = [tuple(point) for point in entry["points"]]
+            craters = [tuple(crater) for crater in entry["craters"]]
+            bank.add(entry["size"], radius, points, craters, image)
+        return bank
+
+    @classmethod
+    def load_or_generate(cls, path, variants_per_size=8, seed=0):
+        """Load a matching bank from path, generating and saving it if needed."""
+        if os.path.exists(path):
+            try:
+                bank = cls.load(path)
+                if bank.variants_per_size == variants_per_size and bank.seed == seed:
+                    return bank
+            except (OSError, ValueError, KeyError, zlib.error) as e:
+                print(f"Regenerating asteroid bank: {e}")
+
+        bank = cls.generate(variants_per_size, seed)
+        bank.save(path)
+        return bank
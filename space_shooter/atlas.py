@@ -0,0 +1,201 @@
+"""Texture atlas shared by the pygame game and the Phaser client.
+
+Every sprite (ship, bullet, each asteroid variant and, optionally,
+pre-rotated ship frames) is packed into one PNG next to a JSON frame map
+in Phaser's "JSON hash" atlas format, so the browser decodes a single
+image and pygame converts a single surface and slices subsurfaces from
+it. Asteroid geometry that the game needs to rebuild its variant bank
+is stored under "meta" -> "asteroids", which Phaser ignores.
+"""
+import json
+import os
+
+import pygame
+
+from asteroid_bank import AsteroidBank, convert_for_display
+from rotation_cache import rotation_cache
+
+# Transparent pixels left around each frame so filtering never bleeds
+DEFAULT_PADDING = 1
+
+# Atlas widths tried by the packer; the one giving the smallest sheet wins
+ATLAS_WIDTHS = (128, 256, 512, 1024, 2048, 4096)
+
+# Pre-rotated frames are named "<frame>@<degrees>"
+ROTATION_SEPARATOR = "@"
+
+
+def asteroid_frame_name(size, index):
+    return f"asteroid_{size}_{index}"
+
+
+def rotated_frame_name(name, angle):
+    return f"{name}{ROTATION_SEPARATOR}{angle:g}"
+
+
+def shelf_pack(sizes, width, padding=DEFAULT_PADDING):
+    """Place (w, h) rectangles on shelves of a sheet this wide.
+
+    Returns ({index: (x, y)}, used height), or None if a rectangle is
+    wider than the sheet. Rectangles go tallest first onto the first
+    shelf with room left, which keeps shelves tight for sprite sets.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    shelves = []  # [y, height, next free x]
+    positions = {}
+    height = 0
+    for i in order:
+        w, h = sizes[i][0] + padding * 2, sizes[i][1] + padding * 2
+        if w > width:
+            return None
+        for shelf in shelves:
+            if h <= shelf[1] and shelf[2] + w <= width:
+                break
+        else:
+            shelf = [height, h, 0]
+            shelves.append(shelf)
+            height += h
+        positions[i] = (shelf[2] + padding, shelf[0] + padding)
+        shelf[2] += w
+    return positions, height
+
+
+def pack(sizes, padding=DEFAULT_PADDING):
+    """Return (positions, (width, height)) for the smallest power-of-two sheet."""
+    best = None
+    for width in ATLAS_WIDTHS:
+        packed = shelf_pack(sizes, width, padding)
+        if packed is None:
+            continue
+        positions, used_height = packed
+        height = 1
+        while height < used_height:
+            height *= 2
+        # Smallest area first, then the squarest sheet
+        key = (width * height, max(width, height))
+        if best is None or key < best[0]:
+            best = (key, positions, (width, height))
+    if best is None:
+        raise ValueError("Sprites do not fit in a 4096 pixel wide atlas")
+    return best[1], best[2]
+
+
+def build_atlas(frames, padding=DEFAULT_PADDING, meta=None, image_name="atlas.png"):
+    """Pack {name: surface} into one surface and a Phaser JSON-hash frame map."""
+    names = list(frames)
+    sizes = [frames[name].get_size() for name in names]
+    positions, (width, height) = pack(sizes, padding)
+
+    sheet = pygame.Surface((width, height), pygame.SRCALPHA)
+    sheet.fill((0, 0, 0, 0))
+    frame_map = {}
+    for i, name in enumerate(names):
+        x, y = positions[i]
+        w, h = sizes[i]
+        sheet.blit(frames[name], (x, y))
+        frame_map[name] = {
+            "frame": {"x": x, "y": y, "w": w, "h": h},
+            "rotated": False,
+            "trimmed": False,
+            "spriteSourceSize": {"x": 0, "y": 0, "w": w, "h": h},
+            "sourceSize": {"w": w, "h": h},
+        }
+
+    document = {
+        "frames": frame_map,
+        "meta": {
+            "image": image_name,
+            "format": "RGBA8888",
+            "size": {"w": width, "h": height},
+            "scale": "1",
+        },
+    }
+    document["meta"].update(meta or {})
+    return sheet, document
+
+
+def sprite_frames(ship, bullet, bank, rotation_step=0):
+    """Collect the game's sprites as {frame name: surface} plus atlas metadata."""
+    frames = {"player_ship": ship, "bullet": bullet}
+    asteroids = []
+    counts = {}
+    for variant in bank.variants:
+        index = counts.get(variant.size, 0)
+        counts[variant.size] = index + 1
+        name = asteroid_frame_name(variant.size, index)
+        frames[name] = variant.image
+        asteroids.append({
+            "frame": name,
+            "size": variant.size,
+            "radius": variant.radius,
+            "points": variant.points,
+            "craters": variant.craters,
+        })
+
+    # Optional ship frames at every cached rotation angle
+    if rotation_step:
+        if not rotation_cache.is_step(rotation_step):
+            raise ValueError(f"rotation_step must be a multiple of the game's "
+                             f"{rotation_cache.step:g} degree rotation cache step")
+        for step in range(1, int(round(360 / rotation_step))):
+            angle = step * rotation_step
+            frames[rotated_frame_name("player_ship", angle)] = pygame.transform.rotate(ship, angle)
+
+    meta = {
+        "asteroids": asteroids,
+        "asteroid_variants_per_size": bank.variants_per_size,
+        "asteroid_seed": bank.seed,
+        "rotation_step": rotation_step,
+    }
+    return frames, meta
+
+
+def save_atlas(sheet, document, image_path):
+    """Write the sheet to image_path and the frame map next to it as .json."""
+    pygame.image.save(sheet, image_path)
+    json_path = os.path.splitext(image_path)[0] + ".json"
+    with open(json_path, "w") as f:
+        json.dump(document, f, separators=(",", ":"), sort_keys=True)
+    return json_path
+
+
+class TextureAtlas:
+    # One converted sheet; every frame is a subsurface sharing its pixels
+    def __init__(self, sheet, document):
+        self.sheet = convert_for_display(sheet)
+        self.meta = document["meta"]
+        self.frames = {}
+        for name, entry in document["frames"].items():
+            frame = entry["frame"]
+            self.frames[name] = self.sheet.subsurface((frame["x"], frame["y"], frame["w"], frame["h"]))
+
+    @classmethod
+    def load(cls, path):
+        """Load an atlas from its .json frame map (the PNG is found next to it)."""
+        json_path = os.path.splitext(path)[0] + ".json"
+        with open(json_path) as f:
+            document = json.load(f)
+        image_path = os.path.join(os.path.dirname(json_path), document["meta"]["image"])
+        return cls(pygame.image.load(image_path), document)
+
+    def __getitem__(self, name):
+        return self.frames[name]
+
+    def __contains__(self, name):
+        return name in self.frames
+
+    def rotations(self, name):
+        """Return {angle: surface} for the pre-rotated frames of name."""
+        prefix = name + ROTATION_SEPARATOR
+        return {float(frame_name[len(prefix):]): surface
+                for frame_name, surface in self.frames.items() if frame_name.startswith(prefix)}
+
+    def asteroid_bank(self):
+        """Rebuild the asteroid variant bank from the packed frames."""
+        bank = AsteroidBank(self.meta["asteroid_variants_per_size"], self.meta["asteroid_seed"])
+        for entry in self.meta["asteroids"]:
+            points = [tuple(point) for point in entry["points"]]
+            craters = [tuple(crater) for crater in entry["craters"]]
+            bank.add(entry["size"], entry["radius"], points, craters, self.frames[entry["frame"]],
+                     convert=False)
+        return bank
@@ -0,0 +1,129 @@
+"""Scripted pilots that drive a headless game.
+
+A pilot returns the keys to hold for the next tick from the game state,
+so it can be passed straight to Game.step(inputs=...).
+"""
+import math
+import random
+
+import pygame
+
+# Key combinations the random pilot picks from
+RANDOM_KEY_SETS = (
+    (),
+    (pygame.K_LEFT,),
+    (pygame.K_RIGHT,),
+    (pygame.K_UP,),
+    (pygame.K_DOWN,),
+    (pygame.K_a, pygame.K_SPACE),
+    (pygame.K_d, pygame.K_SPACE),
+    (pygame.K_SPACE,),
+)
+
+# Aiming tolerance in degrees before the aim pilot fires
+AIM_TOLERANCE = 8
+
+# Asteroids closer than this (plus their radius) push the dodge pilot away
+DANGER_DISTANCE = 120
+
+# Pull toward the screen center so the dodge pilot does not get cornered
+CENTER_PULL = 1e-5
+
+# Pushes weaker than this are ignored, so the ship settles instead of jittering
+PUSH_DEADZONE = 1e-3
+
+
+def heading_to(player, x, y):
+    """Return the player angle (degrees) that points the ship at (x, y)."""
+    # Bullets fly along (sin(-a), -cos(-a)) for a ship angle a
+    return -math.degrees(math.atan2(x - player.x, -(y - player.y)))
+
+
+def angle_difference(target, current):
+    """Signed shortest rotation from current to target, in [-180, 180)."""
+    return (target - current + 180) % 360 - 180
+
+
+def nearest_asteroid(game):
+    player = game.player
+    return min(game.asteroids, default=None,
+               key=lambda asteroid: (asteroid.x - player.x) ** 2 + (asteroid.y - player.y) ** 2)
+
+
+class RandomPilot:
+    # Holds a random key combination for a random number of ticks
+    def __init__(self, seed=None, min_hold=5, max_hold=30):
+        self.rng = random.Random(seed)
+        self.min_hold = min_hold
+        self.max_hold = max_hold
+        self.keys = ()
+        self.hold = 0
+
+    def __call__(self, game):
+        if self.hold <= 0:
+            self.keys = self.rng.choice(RANDOM_KEY_SETS)
+            self.hold = self.rng.randint(self.min_hold, self.max_hold)
+        self.hold -= 1
+        return self.keys
+
+
+class AimPilot:
+    # Stays put, turns toward the nearest asteroid and fires once lined up
+    def __init__(self, seed=None):
+        self.seed = seed
+
+    def __call__(self, game):
+        target = nearest_asteroid(game)
+        if target is None:
+            return []
+
+        player = game.player
+        turn = angle_difference(heading_to(player, target.x, target.y), player.angle)
+        keys = [pygame.K_a] if turn > 0 else [pygame.K_d]
+        if abs(turn) < AIM_TOLERANCE:
+            keys.append(pygame.K_SPACE)
+        return keys
+
+
+class DodgePilot:
+    # Moves away from nearby asteroids while aiming and firing like AimPilot
+    def __init__(self, seed=None):
+        self.aim = AimPilot(seed)
+
+    def __call__(self, game):
+        keys = self.aim(game)
+
+        # Sum of pushes away from close asteroids, strongest when nearest
+        player = game.player
+        screen_width, screen_height = game.screen.get_size()
+        push_x = (screen_width / 2 - player.x) * CENTER_PULL
+        push_y = (screen_height / 2 - player.y) * CENTER_PULL
+        for asteroid in game.asteroids:
+            away_x = player.x - asteroid.x
+            away_y = player.y - asteroid.y
+            distance_squared = away_x * away_x + away_y * away_y
+            reach = DANGER_DISTANCE + asteroid.radius
+            if 0 < distance_squared < reach * reach:
+                push_x += away_x / distance_squared
+                push_y += away_y / distance_squared
+
+        if push_x > PUSH_DEADZONE:
+            keys.append(pygame.K_RIGHT)
+        elif push_x < -PUSH_DEADZONE:
+            keys.append(pygame.K_LEFT)
+        if push_y > PUSH_DEADZONE:
+            keys.append(pygame.K_DOWN)
+        elif push_y < -PUSH_DEADZONE:
+            keys.append(pygame.K_UP)
+        return keys
+
+
+PILOTS = {
+    "random": RandomPilot,
+    "aim": AimPilot,
+    "dodge": DodgePilot,
+}
+
+
+def make_pilot(name, seed=None):
+    return PILOTS[name](seed)
@@ -0,0 +1,66 @@
+"""Benchmark Game.check_collisions as the asteroid count grows.
+
+Run from the space_shooter directory:
+
+    python benchmarks/bench_collisions.py
+"""
+import os
+import random
+import sys
+import time
+
+# Run without opening a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import space_shooter  # noqa: E402
+from space_shooter import WINDOW_WIDTH, WINDOW_HEIGHT, Asteroid, Bullet, Game  # noqa: E402
+
+ASTEROID_COUNTS = [10, 100, 500, 1000, 2000, 5000]
+BULLET_COUNT = 100
+
+
+def build_game(asteroid_count, seed=1):
+    """Create a game with small asteroids and bullets at random positions."""
+    random.seed(seed)
+    game = Game()
+    game.state = space_shooter.PLAYING
+
+    # Small asteroids do not split, so every run sees the same work
+    game.asteroids = [
+        Asteroid(random.uniform(0, WINDOW_WIDTH), random.uniform(0, WINDOW_HEIGHT), 1)
+        for _ in range(asteroid_count)
+    ]
+    game.bullets = [
+        Bullet(random.uniform(0, WINDOW_WIDTH), random.uniform(0, WINDOW_HEIGHT), random.uniform(0, 360))
+        for _ in range(BULLET_COUNT)
+    ]
+    game.player.invulnerable = True
+    return game
+
+
+def time_collisions(game, repeat):
+    asteroids = list(game.asteroids)
+    bullets = list(game.bullets)
+    elapsed = 0.0
+    for _ in range(repeat):
+        # Restore the lists removed by the previous run
+        game.asteroids = list(asteroids)
+        game.bullets = list(bullets)
+        start = time.perf_counter()
+        game.check_collisions()
+        elapsed += time.perf_counter() - start
+    return elapsed / repeat
+
+
+def main():
+    print(f"{'asteroids':>10} {'ms/tick':>10} {'us/asteroid':>12}")
+    for count in ASTEROID_COUNTS:
+        game = build_game(count)
+        repeat = max(5, 20000 // count)
+        per_tick = time_collisions(game, repeat)
+        print(f"{count:>10} {per_tick * 1000:>10.3f} {per_tick * 1e6 / count:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark environment steps per second, single and vectorized.
+
+Run from the space_shooter directory:
+
+    python benchmarks/bench_env.py --envs 8 --steps 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+# Run without opening a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+from env import OBS_FEATURES, OBS_FRAMES, SpaceShooterEnv, SpaceShooterVectorEnv  # noqa: E402
+
+
+def bench_single(obs_type, steps):
+    env = SpaceShooterEnv(seed=0, obs_type=obs_type)
+    rng = np.random.default_rng(0)
+    actions = rng.integers(env.n_actions, size=steps)
+    obs = np.empty(env.observation_shape, dtype=env.observation_dtype)
+    env.reset(out=obs)
+    start = time.perf_counter()
+    for action in actions:
+        _, _, terminated, truncated, _ = env.step(action, out=obs)
+        if terminated or truncated:
+            env.reset(out=obs)
+    return steps / (time.perf_counter() - start)
+
+
+def bench_vector(obs_type, num_envs, steps):
+    with SpaceShooterVectorEnv(num_envs, seed=0, obs_type=obs_type) as env:
+        rng = np.random.default_rng(0)
+        env.reset()
+        start = time.perf_counter()
+        for _ in range(steps):
+            env.step(rng.integers(env.n_actions, size=num_envs))
+        return steps * num_envs / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the RL environments.")
+    parser.add_argument("--envs", type=int, default=os.cpu_count(), help="Environments in the vector env")
+    parser.add_argument("--steps", type=int, default=2000, help="Steps per benchmark")
+    args = parser.parse_args()
+
+    print(f"{'obs':>8} {'single steps/s':>15} {'vector steps/s':>15}")
+    for obs_type in (OBS_FEATURES, OBS_FRAMES):
+        single = bench_single(obs_type, args.steps)
+        vector = bench_vector(obs_type, args.envs, args.steps)
+        print(f"{obs_type:>8} {single:>15.0f} {vector:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
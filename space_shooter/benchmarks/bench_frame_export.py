@@ -0,0 +1,61 @@
+"""Benchmark frame export: byte copies against surfarray views.
+
+Run from the space_shooter directory:
+
+    python benchmarks/bench_frame_export.py
+"""
+import os
+import sys
+import time
+
+# Run without opening a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import pygame  # noqa: E402
+from frame_export import FrameExporter  # noqa: E402
+from space_shooter import Game  # noqa: E402
+
+
+def copy_tobytes(surface):
+    width, height = surface.get_size()
+    return np.frombuffer(pygame.image.tobytes(surface, "RGB"), dtype=np.uint8).reshape(height, width, 3)
+
+
+def time_call(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    game = Game(headless=True, seed=1)
+    game.start_new_game()
+    for _ in range(60):
+        game.step(inputs=(pygame.K_SPACE, pygame.K_a), render=True)
+    screen = game.screen
+
+    full = FrameExporter(screen)
+    gray = FrameExporter(screen, grayscale=True)
+    small = FrameExporter(screen, size=(84, 84), grayscale=True)
+
+    def view_only():
+        full.with_pixels(lambda rgb: rgb[0, 0, 0])
+
+    cases = [
+        ("image.tobytes copy", lambda: copy_tobytes(screen)),
+        ("pixels3d view", view_only),
+        ("rgb into reused buffer", full.observe),
+        ("grayscale, full size", gray.observe),
+        ("grayscale, 84x84", small.observe),
+    ]
+    repeat = 200
+    print(f"{'path':<24} {'us/frame':>10}")
+    for name, func in cases:
+        print(f"{name:<24} {time_call(func, repeat) * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark Game snapshot and restore as the entity count grows.
+
+Run from the space_shooter directory:
+
+    python benchmarks/bench_snapshot.py
+"""
+import os
+import sys
+import time
+
+# Run without opening a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from space_shooter import WINDOW_WIDTH, WINDOW_HEIGHT, Game  # noqa: E402
+
+ENTITY_COUNTS = [10, 100, 1000]
+
+
+def build_game(entity_count, seed=1):
+    """Create a game with half asteroids and half bullets at random positions."""
+    game = Game(headless=True, seed=seed)
+    game.start_new_game()
+    game.bullet_pool.release_all(game.bullets)
+    game.asteroid_pool.release_all(game.asteroids)
+
+    rng = game.spawn_rng
+    game.asteroids = [
+        game.asteroid_pool.acquire(rng.uniform(0, WINDOW_WIDTH), rng.uniform(0, WINDOW_HEIGHT),
+                                   rng.randint(1, 3), game.asteroid_rng)
+        for _ in range(entity_count // 2)
+    ]
+    game.bullets = [
+        game.bullet_pool.acquire(rng.uniform(0, WINDOW_WIDTH), rng.uniform(0, WINDOW_HEIGHT),
+                                 rng.uniform(0, 360), timer=game.timer)
+        for _ in range(entity_count - entity_count // 2)
+    ]
+    return game
+
+
+def time_call(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    print(f"{'entities':>8} {'mode':>9} {'bytes':>8} {'snapshot us':>12} {'restore us':>11} {'exact':>6}")
+    for count in ENTITY_COUNTS:
+        game = build_game(count)
+        target = Game(headless=True, seed=2)
+        repeat = max(20, 20000 // count)
+        for quantize in (True, False):
+            data = game.snapshot(quantize)
+            snapshot_time = time_call(lambda: game.snapshot(quantize), repeat)
+            restore_time = time_call(lambda: target.restore_snapshot(data), repeat)
+
+            # Restoring and packing again must give back the same bytes
+            exact = target.snapshot(quantize) == data
+            mode = "quantized" if quantize else "exact"
+            print(f"{count:>8} {mode:>9} {len(data):>8} {snapshot_time * 1e6:>12.1f} "
+                  f"{restore_time * 1e6:>11.1f} {str(exact):>6}")
+
+
+if __name__ == "__main__":
+    main()
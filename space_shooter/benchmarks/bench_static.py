@@ -0,0 +1,82 @@
+"""Load test /static: send_from_directory against the preloaded asset layer.
+
+Requests go through the WSGI test client, so the numbers are the app's
+own cost per request without network or server overhead. Run from the
+space_shooter directory:
+
+    python benchmarks/bench_static.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, send_from_directory  # noqa: E402
+
+import app as web  # noqa: E402
+
+# Seconds spent on each case
+DURATION = 2.0
+
+ASSETS = ["player_ship.png", "asteroid.png", "bullet.png"]
+
+
+def make_baseline_app():
+    """The route as it was: send_from_directory on every hit."""
+    baseline = Flask(__name__, root_path=web.app.root_path, static_folder=None)
+
+    @baseline.route('/static/<path:path>')
+    def send_static(path):
+        return send_from_directory('static', path)
+
+    return baseline
+
+
+def requests_per_second(client, urls, headers=None):
+    """Return (requests/s, mean body bytes, last status) for cycling through urls."""
+    count = 0
+    body_bytes = 0
+    status = None
+    start = time.perf_counter()
+    end = start + DURATION
+    while time.perf_counter() < end:
+        for url in urls:
+            response = client.get(url, headers=headers)
+            body_bytes += len(response.data)
+            status = response.status_code
+        count += len(urls)
+    return count / (time.perf_counter() - start), body_bytes / count, status
+
+
+def main():
+    baseline = make_baseline_app().test_client()
+    cached = web.app.test_client()
+    plain = [f"/static/{name}" for name in ASSETS]
+    fingerprinted = [web.static_assets.url(name) for name in ASSETS]
+
+    class RevalidatingClient:
+        # Sends the ETag from a previous response, as a browser would
+        def __init__(self, client):
+            self.client = client
+            self.etags = {url: client.get(url).headers["ETag"] for url in plain}
+
+        def get(self, url, headers=None):
+            return self.client.get(url, headers={"If-None-Match": self.etags[url]})
+
+    cases = [
+        ("send_from_directory", baseline, plain, None),
+        ("send_from_directory 304", RevalidatingClient(baseline), plain, None),
+        ("preloaded", cached, plain, None),
+        ("preloaded 304", RevalidatingClient(cached), plain, None),
+        ("preloaded fingerprinted", cached, fingerprinted, None),
+        ("preloaded range", cached, plain, {"Range": "bytes=0-99"}),
+    ]
+    print(f"{'case':<26} {'req/s':>10} {'bytes':>8} {'status':>7}")
+    for name, client, urls, headers in cases:
+        rate, size, status = requests_per_second(client, urls, headers)
+        print(f"{name:<26} {rate:>10.0f} {size:>8.0f} {status:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Measure CPU used by Game.run while sitting on the menu screen.
+
+Runs the real main loop (on the SDL dummy video driver) for a few seconds
+with and without the idle-aware loop and reports CPU time per wall second:
+
+    python benchmarks/idle_cpu.py --seconds 5
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+# Run without opening a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame  # noqa: E402
+from space_shooter import Game  # noqa: E402
+
+
+def measure(idle_wait, seconds):
+    """Return CPU seconds used per wall-clock second on the menu."""
+    game = Game(idle_wait=idle_wait)
+
+    # Post QUIT from a timer thread so the loop exits on its own
+    timer = threading.Timer(seconds, lambda: pygame.event.post(pygame.event.Event(pygame.QUIT)))
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    timer.start()
+    try:
+        game.run()
+    except SystemExit:
+        pass
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+
+    # Game.run shuts pygame down on exit
+    pygame.init()
+    return cpu / wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure idle CPU usage on the menu screen.")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    for label, idle_wait in (("fixed 60 FPS loop", False), ("idle-aware loop", True)):
+        usage = measure(idle_wait, args.seconds)
+        print(f"{label:<20} {usage * 100:6.1f}% of one core")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""Fixed-seed scenario benchmarks for the pygame game.
+
+Each scenario drives a headless Game through a fixed number of frames and
+records per-phase timings, allocation counts and peak memory. Timings are
+the median of several repeats, and a phase only counts as regressed when
+it is slower by both the relative threshold and MIN_REGRESSION_MS and its
+fastest repeat is slower than the baseline's slowest. Results are written
+as JSON and can be compared against a committed baseline:
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --update-baseline
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Run without opening a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame  # noqa: E402
+import space_shooter  # noqa: E402
+from rotation_cache import rotation_cache  # noqa: E402
+from space_shooter import GAME_OVER, MENU, Game  # noqa: E402
+from timing import PhaseTimer  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+PHASES = ("handle_events", "update", "check_collisions", "draw")
+
+# Regressions smaller than this many milliseconds per frame are noise
+MIN_REGRESSION_MS = 0.2
+
+
+def setup_idle_menu(game):
+    game.state = MENU
+    return ()
+
+
+def setup_level_1(game):
+    game.start_new_game()
+    game.player.invulnerable_duration = float("inf")
+    game.player.hit()
+    return (pygame.K_SPACE, pygame.K_a)
+
+
+def setup_level_20(game):
+    game.start_new_game()
+    game.level = 20
+    max_asteroids = game.difficulty.max_asteroids(game.level)
+    while len(game.asteroids) < max_asteroids:
+        game.spawn_asteroid_away_from_player()
+    game.player.invulnerable_duration = float("inf")
+    game.player.hit()
+    return (pygame.K_SPACE, pygame.K_d)
+
+
+def setup_bullet_spam(game):
+    game.start_new_game()
+    game.player.shoot_cooldown = 0
+    game.player.invulnerable_duration = float("inf")
+    game.player.hit()
+    return (pygame.K_SPACE, pygame.K_a)
+
+
+def setup_game_over(game):
+    setup_level_20(game)
+    for _ in range(30):
+        game.step(inputs=(pygame.K_SPACE,))
+    game.state = GAME_OVER
+    return ()
+
+
+SCENARIOS = {
+    "idle_menu": setup_idle_menu,
+    "level_1": setup_level_1,
+    "level_20": setup_level_20,
+    "bullet_spam": setup_bullet_spam,
+    "game_over": setup_game_over,
+}
+
+
+def build_game(name, seed):
+    game = Game(headless=True, seed=seed)
+    inputs = space_shooter.KeyState(SCENARIOS[name](game))
+    return game, inputs
+
+
+def run_frame(game, inputs, dt):
+    game.handle_events()
+    game.timer.advance(dt)
+    game.update(inputs)
+    game.draw()
+
+
+def time_scenario(name, frames, seed):
+    """Return mean milliseconds per frame for each phase."""
+    game, inputs = build_game(name, seed)
+    collisions = PhaseTimer(game.check_collisions)
+    game.check_collisions = collisions
+    totals = dict.fromkeys(PHASES, 0.0)
+    dt = 1000 / space_shooter.FPS
+
+    for _ in range(frames):
+        start = time.perf_counter()
+        game.handle_events()
+        events_done = time.perf_counter()
+        game.timer.advance(dt)
+        collisions_before = collisions.elapsed
+        game.update(inputs)
+        update_done = time.perf_counter()
+        game.draw()
+        draw_done = time.perf_counter()
+
+        collision_time = collisions.elapsed - collisions_before
+        totals["handle_events"] += events_done - start
+        totals["update"] += update_done - events_done - collision_time
+        totals["check_collisions"] += collision_time
+        totals["draw"] += draw_done - update_done
+
+    phases = {phase: totals[phase] * 1000 / frames for phase in PHASES}
+    return phases, {"asteroids": len(game.asteroids), "bullets": len(game.bullets)}
+
+
+def measure_memory(name, frames, seed):
+    """Return allocation counts, GC activity and peak traced memory."""
+    # Start cold so the figures do not depend on which scenarios ran first
+    rotation_cache.clear()
+    gc.collect()
+    collections_before = sum(stat["collections"] for stat in gc.get_stats())
+    tracemalloc.start()
+    game, inputs = build_game(name, seed)
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+    dt = 1000 / space_shooter.FPS
+    for _ in range(frames):
+        run_frame(game, inputs, dt)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    collections = sum(stat["collections"] for stat in gc.get_stats()) - collections_before
+
+    new_blocks = sum(stat.count_diff for stat in after.compare_to(before, "lineno") if stat.count_diff > 0)
+    return {
+        "allocated_blocks": new_blocks,
+        "gc_collections": collections,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def time_repeats(scenarios, frames, seed, repeats):
+    """Return {scenario: (per-phase (median, fastest, slowest) ms, entities)}.
+
+    Repeats are interleaved across scenarios, so a burst of load on the
+    machine slows one run of several scenarios rather than every run of one.
+    """
+    runs = {name: [] for name in scenarios}
+    entities = {}
+    for _ in range(repeats):
+        for name in scenarios:
+            phases, entities[name] = time_scenario(name, frames, seed)
+            runs[name].append(phases)
+    summaries = {}
+    for name in scenarios:
+        summary = {}
+        for phase in PHASES:
+            values = [run[phase] for run in runs[name]]
+            summary[phase] = (statistics.median(values), min(values), max(values))
+        summaries[name] = (summary, entities[name])
+    return summaries
+
+
+def run_suite(scenarios, frames, seed, repeats):
+    results = {
+        "meta": {
+            "frames": frames,
+            "seed": seed,
+            "repeats": repeats,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+        },
+        "scenarios": {},
+    }
+    timings = time_repeats(scenarios, frames, seed, repeats)
+    for name in scenarios:
+        phases, entities = timings[name]
+        memory = measure_memory(name, frames, seed)
+        results["scenarios"][name] = {
+            "phases_ms": {phase: round(median, 4) for phase, (median, _, _) in phases.items()},
+            "phases_range_ms": {phase: [round(fastest, 4), round(slowest, 4)]
+                                for phase, (_, fastest, slowest) in phases.items()},
+            "frame_ms": round(sum(median for median, _, _ in phases.values()), 4),
+            "entities": entities,
+            "memory": memory,
+        }
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return a list of human readable regressions."""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        reference = baseline.get("scenarios", {}).get(name)
+        if reference is None:
+            continue
+
+        # Per-phase median timings; overlapping repeat ranges are not significant
+        for phase, value in current["phases_ms"].items():
+            base = reference["phases_ms"].get(phase)
+            if base is None:
+                continue
+            if value <= base * (1 + threshold) or value - base <= MIN_REGRESSION_MS:
+                continue
+            base_range = reference.get("phases_range_ms", {}).get(phase)
+            current_range = current.get("phases_range_ms", {}).get(phase)
+            if base_range and current_range and current_range[0] <= base_range[1]:
+                continue
+            regressions.append(f"{name}.{phase}: {base:.3f} ms -> {value:.3f} ms")
+
+        # Peak memory
+        base_peak = reference["memory"]["peak_kib"]
+        peak = current["memory"]["peak_kib"]
+        if peak > base_peak * (1 + threshold):
+            regressions.append(f"{name}.peak_kib: {base_peak} KiB -> {peak} KiB")
+    return regressions
+
+
+def print_table(results):
+    print(f"{'scenario':<12} " + " ".join(f"{phase:>16}" for phase in PHASES) + f" {'frame':>8} {'peak KiB':>9}")
+    for name, result in results["scenarios"].items():
+        phases = " ".join(f"{result['phases_ms'][phase]:>16.3f}" for phase in PHASES)
+        print(f"{name:<12} {phases} {result['frame_ms']:>8.3f} {result['memory']['peak_kib']:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Space Shooter scenario benchmarks.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable, default: all)")
+    parser.add_argument("--frames", type=int, default=300, help="Frames per scenario")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed")
+    parser.add_argument("--repeats", type=int, default=5,
+                        help="Timed runs per scenario; the median is reported (default 5)")
+    parser.add_argument("--output", help="Write results JSON to this path")
+    parser.add_argument("--baseline", help="Compare against this baseline JSON")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed relative slowdown before failing (default 0.25)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help=f"Overwrite {os.path.relpath(DEFAULT_BASELINE)} with these results")
+    args = parser.parse_args()
+
+    results = run_suite(args.scenario or list(SCENARIOS), args.frames, args.seed, args.repeats)
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.update_baseline:
+        with open(DEFAULT_BASELINE, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {DEFAULT_BASELINE}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("Performance regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Build the web client bundle served by app.py.
+
+Minifies static/js/game.js in pure Python, writes it as
+static/js/game.<hash>.js and records the name in static/manifest.json.
+The asset_url() template helper in app.py looks bundles up there, so the
+HTML shell points at a URL that changes only when the script does and
+can be cached as immutable. Checkouts that were never built fall back to
+serving the unminified source.
+
+    python build_client.py
+"""
+import hashlib
+import json
+import os
+
+# Bundles to build, as paths relative to static/
+BUNDLES = ["js/game.js"]
+
+MANIFEST_NAME = "manifest.json"
+
+# Hex digits of the content hash in bundle names
+HASH_LENGTH = 12
+
+# After these keywords a "/" starts a regular expression, not a division
+REGEX_KEYWORDS = {
+    "return", "typeof", "instanceof", "case", "do", "else", "in", "of", "new",
+    "delete", "void", "throw", "yield", "await",
+}
+
+# A newline after one of these, or before one of the closers, cannot end a statement
+JOIN_AFTER = set("{[(,;")
+JOIN_BEFORE = set("}]),;")
+
+
+def is_word_char(char):
+    return char.isalnum() or char in "_$"
+
+
+def skip_string(source, i):
+    """Return the index just past the string or template literal starting at i."""
+    quote = source[i]
+    i += 1
+    depth = 0  # Nesting of ${ } inside a template literal
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            i += 2
+            continue
+        if quote == "`":
+            if source.startswith("${", i):
+                depth += 1
+                i += 2
+                continue
+            if char == "}" and depth:
+                depth -= 1
+        if char == quote and depth == 0:
+            return i + 1
+        i += 1
+    raise ValueError(f"Unterminated string starting with {quote}")
+
+
+def skip_regex(source, i):
+    """Return the index just past the regular expression literal starting at i."""
+    i += 1
+    in_class = False
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "[":
+            in_class = True
+        elif char == "]":
+            in_class = False
+        elif char == "/" and not in_class:
+            i += 1
+            while i < len(source) and is_word_char(source[i]):  # Flags
+                i += 1
+            return i
+        elif char == "\n":
+            break
+        i += 1
+    raise ValueError("Unterminated regular expression")
+
+
+def regex_allowed(out):
+    # A "/" starts a regex after an operator, an opening bracket or certain keywords
+    text = "".join(out[-16:]).rstrip()
+    if not text:
+        return True
+    if not is_word_char(text[-1]):
+        return text[-1] not in ")]}"
+    word = text.split()[-1]
+    for index in range(len(word) - 1, -1, -1):
+        if not is_word_char(word[index]):
+            word = word[index + 1:]
+            break
+    return word in REGEX_KEYWORDS
+
+
+def minify_js(source):
+    """Strip comments and redundant whitespace from JavaScript.
+
+    Line breaks are kept wherever automatic semicolon insertion could
+    depend on them, so scripts that omit semicolons keep their meaning.
+    Strings, template literals and regular expressions are copied as-is.
+    """
+    out = []
+    pending_space = pending_newline = False
+    i = 0
+    while i < len(source):
+        char = source[i]
+
+        # Whitespace and comments collapse into a pending separator
+        if char in " \t\r\n" or source.startswith("//", i) or source.startswith("/*", i):
+            if char == "\n":
+                pending_newline = True
+            elif source.startswith("//", i):
+                end = source.find("\n", i)
+                i = len(source) if end == -1 else end
+                continue
+            elif source.startswith("/*", i):
+                end = source.find("*/", i + 2)
+                if end == -1:
+                    raise ValueError("Unterminated comment")
+                pending_newline |= "\n" in source[i:end]
+                i = end + 2
+                continue
+            pending_space = True
+            i += 1
+            continue
+
+        if out and (pending_space or pending_newline):
+            previous = out[-1][-1]
+            if pending_newline and previous not in JOIN_AFTER and char not in JOIN_BEFORE:
+                out.append("\n")
+            elif (is_word_char(previous) and is_word_char(char)) or previous + char in ("++", "--"):
+                out.append(" ")
+        pending_space = pending_newline = False
+
+        if char in "'\"`":
+            end = skip_string(source, i)
+        elif char == "/" and regex_allowed(out):
+            end = skip_regex(source, i)
+        else:
+            end = i + 1
+        out.append(source[i:end])
+        i = end
+    return "".join(out)
+
+
+def bundle_name(path, content):
+    """Return path with a content hash inserted before the extension."""
+    stem, extension = os.path.splitext(path)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:HASH_LENGTH]}{extension}"
+
+
+def load_manifest(static_dir):
+    try:
+        with open(os.path.join(static_dir, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def build_bundle(static_dir, path):
+    """Minify one bundle and return its hashed path relative to static_dir."""
+    with open(os.path.join(static_dir, path), encoding="utf-8") as f:
+        source = f.read()
+    content = minify_js(source).encode("utf-8")
+    built = bundle_name(path, content)
+    with open(os.path.join(static_dir, built), "wb") as f:
+        f.write(content)
+    print(f"Built {built}: {len(source.encode('utf-8'))} -> {len(content)} bytes")
+    return built
+
+
+def main():
+    """Build every bundle and rewrite the manifest."""
+    static_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+    previous = load_manifest(static_dir)
+    manifest = {path: build_bundle(static_dir, path) for path in BUNDLES}
+
+    # Drop bundles from earlier builds
+    for path, built in previous.items():
+        if manifest.get(path) != built and os.path.exists(os.path.join(static_dir, built)):
+            os.remove(os.path.join(static_dir, built))
+
+    manifest_path = os.path.join(static_dir, MANIFEST_NAME)
+    with open(manifest_path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    print(f"Wrote {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""Optional NumPy struct-of-arrays storage for bullets and asteroids.
+
+Positions, velocities and the other per-entity fields live in
+preallocated arrays so movement, screen wrap, bullet expiry and the
+circle-overlap tests run as single vectorized kernels. Thin view objects
+keep the attributes and draw() method the rendering code expects.
+"""
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only needed for the entity store
+    np = None
+
+from rotation_cache import rotation_cache
+
+# Upper bound on bullet x asteroid pairs tested per collision chunk
+COLLISION_CHUNK = 1 << 20
+
+# Array name, per-entity shape and dtype
+BULLET_FIELDS = (
+    ("bullet_pos", (2,), "f8"),
+    ("bullet_vel", (2,), "f8"),
+    ("bullet_radius", (), "f8"),
+    ("bullet_birth", (), "i8"),
+)
+ASTEROID_FIELDS = (
+    ("asteroid_pos", (2,), "f8"),
+    ("asteroid_vel", (2,), "f8"),
+    ("asteroid_radius", (), "f8"),
+    ("asteroid_hit_radius", (), "f8"),
+    ("asteroid_rotation", (), "f8"),
+    ("asteroid_rotation_speed", (), "f8"),
+    ("asteroid_size", (), "i1"),
+)
+
+
+class BulletView:
+    __slots__ = ("store", "slot", "image", "radius")
+
+    def __init__(self, store, slot, image, radius):
+        self.store = store
+        self.slot = slot
+        self.image = image
+        self.radius = radius
+
+    @property
+    def x(self):
+        return float(self.store.bullet_pos[self.slot, 0])
+
+    @property
+    def y(self):
+        return float(self.store.bullet_pos[self.slot, 1])
+
+    @property
+    def rect(self):
+        return self.image.get_rect(center=(self.x, self.y))
+
+    def draw(self, screen):
+        x, y = self.store.bullet_pos[self.slot]
+        return screen.blit(self.image, (int(x) - self.radius, int(y) - self.radius))
+
+    def get_collision_radius(self):
+        return self.radius
+
+
+class AsteroidView:
+    __slots__ = ("store", "slot", "original_image", "variant_id", "image", "rect", "size", "radius", "rng")
+
+    def __init__(self, store, slot, original_image, variant_id, size, radius, rng):
+        self.store = store
+        self.slot = slot
+        self.original_image = original_image
+        self.variant_id = variant_id
+        self.image = original_image
+        self.rect = original_image.get_rect()
+        self.size = size
+        self.radius = radius
+        self.rng = rng
+
+    @property
+    def x(self):
+        return float(self.store.asteroid_pos[self.slot, 0])
+
+    @property
+    def y(self):
+        return float(self.store.asteroid_pos[self.slot, 1])
+
+    @property
+    def rotation(self):
+        return float(self.store.asteroid_rotation[self.slot])
+
+    def draw(self, screen):
+        store = self.store
+        self.image, self.rect = rotation_cache.rotate(
+            self.original_image, store.asteroid_rotation[self.slot], store.asteroid_pos[self.slot])
+        return screen.blit(self.image, self.rect.topleft)
+
+    def get_collision_radius(self):
+        return self.radius * 0.8
+
+
+class EntityStore:
+    def __init__(self, bullet_capacity=256, asteroid_capacity=256, bullet_lifespan=3000):
+        if np is None:
+            raise ImportError("EntityStore requires numpy")
+
+        self.bullet_lifespan = bullet_lifespan
+
+        # Bullets
+        self.bullet_count = 0
+        self.bullet_views = []
+        self._allocate_bullets(bullet_capacity)
+
+        # Asteroids
+        self.asteroid_count = 0
+        self.asteroid_views = []
+        self._allocate_asteroids(asteroid_capacity)
+
+    def _allocate(self, fields, count, capacity):
+        # (Re)allocate arrays, keeping the first count rows
+        for name, shape, dtype in fields:
+            array = np.zeros((capacity,) + shape, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                array[:count] = old[:count]
+            setattr(self, name, array)
+
+    def _allocate_bullets(self, capacity):
+        self.bullet_capacity = capacity
+        self._allocate(BULLET_FIELDS, self.bullet_count, capacity)
+
+    def _allocate_asteroids(self, capacity):
+        self.asteroid_capacity = capacity
+        self._allocate(ASTEROID_FIELDS, self.asteroid_count, capacity)
+
+    def clear(self):
+        self.bullet_count = 0
+        self.asteroid_count = 0
+        self.bullet_views = []
+        self.asteroid_views = []
+
+    def add_bullet(self, bullet):
+        """Copy a Bullet into the arrays and return its view."""
+        slot = self.bullet_count
+        if slot == self.bullet_capacity:
+            self._allocate_bullets(self.bullet_capacity * 2)
+        self.bullet_pos[slot] = (bullet.x, bullet.y)
+        self.bullet_vel[slot] = (bullet.dx, bullet.dy)
+        self.bullet_radius[slot] = bullet.get_collision_radius()
+        self.bullet_birth[slot] = bullet.creation_time
+        self.bullet_count += 1
+
+        view = BulletView(self, slot, bullet.image, bullet.radius)
+        self.bullet_views.append(view)
+        return view
+
+    def add_asteroid(self, asteroid):
+        """Copy an Asteroid into the arrays and return its view."""
+        slot = self.asteroid_count
+        if slot == self.asteroid_capacity:
+            self._allocate_asteroids(self.asteroid_capacity * 2)
+        self.asteroid_pos[slot] = (asteroid.x, asteroid.y)
+        self.asteroid_vel[slot] = (asteroid.dx, asteroid.dy)
+        self.asteroid_radius[slot] = asteroid.radius
+        self.asteroid_hit_radius[slot] = asteroid.get_collision_radius()
+        self.asteroid_rotation[slot] = asteroid.rotation
+        self.asteroid_rotation_speed[slot] = asteroid.rotation_speed
+        self.asteroid_size[slot] = asteroid.size
+        self.asteroid_count += 1
+
+        view = AsteroidView(self, slot, asteroid.original_image, asteroid.variant_id,
+                            asteroid.size, asteroid.radius, asteroid.rng)
+        self.asteroid_views.append(view)
+        return view
+
+    def _compact(self, fields, count, views, keep):
+        # Move surviving rows to the front of every array of this kind
+        kept = int(keep.sum())
+        for name, _, _ in fields:
+            array = getattr(self, name)
+            array[:kept] = array[:count][keep]
+
+        survivors = [view for view, alive in zip(views, keep.tolist()) if alive]
+        for slot, view in enumerate(survivors):
+            view.slot = slot
+        return kept, survivors
+
+    def remove_bullets(self, keep):
+        """Drop bullets whose entry in the boolean keep mask is False."""
+        if keep.all():
+            return
+        self.bullet_count, self.bullet_views = self._compact(
+            BULLET_FIELDS, self.bullet_count, self.bullet_views, keep)
+
+    def remove_asteroids(self, keep):
+        """Drop asteroids whose entry in the boolean keep mask is False."""
+        if keep.all():
+            return
+        self.asteroid_count, self.asteroid_views = self._compact(
+            ASTEROID_FIELDS, self.asteroid_count, self.asteroid_views, keep)
+
+    def remove_bullet_slots(self, slots):
+        if len(slots):
+            keep = np.ones(self.bullet_count, dtype=bool)
+            keep[slots] = False
+            self.remove_bullets(keep)
+
+    def remove_asteroid_slots(self, slots):
+        if len(slots):
+            keep = np.ones(self.asteroid_count, dtype=bool)
+            keep[slots] = False
+            self.remove_asteroids(keep)
+
+    def step_bullets(self, now, screen_width, screen_height):
+        """Move every bullet and drop those off screen or past their lifespan."""
+        count = self.bullet_count
+        if not count:
+            return
+        pos = self.bullet_pos[:count]
+        pos += self.bullet_vel[:count]
+
+        # Same margins as Bullet.update
+        x = pos[:, 0]
+        y = pos[:, 1]
+        keep = ((x >= -10) & (x <= screen_width + 10) &
+                (y >= -10) & (y <= screen_height + 10) &
+                (now - self.bullet_birth[:count] <= self.bullet_lifespan))
+        self.remove_bullets(keep)
+
+    def step_asteroids(self, screen_width, screen_height):
+        """Move, rotate and wrap every asteroid around the screen edges."""
+        count = self.asteroid_count
+        if not count:
+            return
+        pos = self.asteroid_pos[:count]
+        pos += self.asteroid_vel[:count]
+        self.asteroid_rotation[:count] += self.asteroid_rotation_speed[:count]
+
+        # Same wrap rule as Asteroid.update
+        radius = self.asteroid_radius[:count]
+        for axis, extent in ((0, screen_width), (1, screen_height)):
+            coord = pos[:, axis]
+            low = coord < -radius
+            high = coord > extent + radius
+            coord[low] = extent + radius[low]
+            coord[high] = -radius[high]
+
+    def collide_bullets(self):
+        """Return (bullet slots, asteroid slots) for this tick's hits.
+
+        Bullets are resolved in slot order, each hitting the first
+        overlapping asteroid not already claimed by an earlier bullet, as
+        the object path does. Unlike the object path, fragments split off
+        this tick cannot be hit until the next one.
+        """
+        bullets = self.bullet_count
+        asteroids = self.asteroid_count
+        if not bullets or not asteroids:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty
+
+        asteroid_pos = self.asteroid_pos[:asteroids]
+        asteroid_reach = self.asteroid_hit_radius[:asteroids]
+        hit_bullets = []
+        hit_asteroids = []
+
+        # Overlap tests are vectorised; hits are rare, so claiming is a short loop
+        chunk = max(1, COLLISION_CHUNK // asteroids)
+        for start in range(0, bullets, chunk):
+            stop = min(bullets, start + chunk)
+            delta = self.bullet_pos[start:stop, None, :] - asteroid_pos[None, :, :]
+            dist_sq = np.einsum("ijk,ijk->ij", delta, delta)
+            reach = self.bullet_radius[start:stop, None] + asteroid_reach[None, :]
+            rows, cols = np.nonzero(dist_sq < reach * reach)
+            hit_bullets.extend((rows + start).tolist())
+            hit_asteroids.extend(cols.tolist())
+
+        # Pairs come in (bullet, asteroid) order, so a losing bullet falls through to its next hit
+        claimed = set()
+        bullet_slots = []
+        asteroid_slots = []
+        for bullet, asteroid in zip(hit_bullets, hit_asteroids):
+            if asteroid in claimed or (bullet_slots and bullet_slots[-1] == bullet):
+                continue
+            claimed.add(asteroid)
+            bullet_slots.append(bullet)
+            asteroid_slots.append(asteroid)
+        return np.array(bullet_slots, dtype=np.intp), np.array(asteroid_slots, dtype=np.intp)
+
+    def collide_point(self, x, y, radius, exclude=()):
+        """Return the first asteroid slot overlapping a circle, or -1.
+
+        Slots in exclude (e.g. asteroids already destroyed this tick) are skipped.
+        """
+        count = self.asteroid_count
+        if not count:
+            return -1
+        delta = self.asteroid_pos[:count] - (x, y)
+        dist_sq = np.einsum("ij,ij->i", delta, delta)
+        reach = self.asteroid_hit_radius[:count] + radius
+        for slot in np.flatnonzero(dist_sq < reach * reach).tolist():
+            if slot not in exclude:
+                return slot
+        return -1
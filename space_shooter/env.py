@@ -0,0 +1,336 @@
+"""Reinforcement-learning environments around headless games.
+
+SpaceShooterEnv follows the Gym reset()/step() convention with a discrete
+action space mapped onto the player's keyboard controls. Observations are
+either entity feature vectors or downscaled grayscale frames.
+
+SpaceShooterVectorEnv runs N environments in worker processes. Actions,
+observations, rewards and episode flags live in shared-memory NumPy
+arrays, so the pipes to the workers only carry short commands and
+nothing is pickled per step.
+
+    env = SpaceShooterVectorEnv(8, seed=0)
+    obs = env.reset()
+    obs, rewards, terminated, truncated, info = env.step(actions)
+    env.close()
+"""
+import math
+import multiprocessing
+import traceback
+from multiprocessing import shared_memory
+
+import numpy as np
+import pygame
+
+from frame_export import FrameExporter
+from space_shooter import GAME_OVER, WINDOW_HEIGHT, WINDOW_WIDTH, Game
+
+# Discrete actions as the keys held for the tick
+ACTIONS = (
+    (),
+    (pygame.K_LEFT,),
+    (pygame.K_RIGHT,),
+    (pygame.K_UP,),
+    (pygame.K_DOWN,),
+    (pygame.K_a,),
+    (pygame.K_d,),
+    (pygame.K_SPACE,),
+    (pygame.K_a, pygame.K_SPACE),
+    (pygame.K_d, pygame.K_SPACE),
+    (pygame.K_UP, pygame.K_SPACE),
+)
+ACTION_MEANINGS = (
+    "NOOP", "LEFT", "RIGHT", "UP", "DOWN", "ROTATE_LEFT", "ROTATE_RIGHT",
+    "SHOOT", "ROTATE_LEFT_SHOOT", "ROTATE_RIGHT_SHOOT", "UP_SHOOT",
+)
+
+OBS_FEATURES = "features"
+OBS_FRAMES = "frames"
+
+# Reward: score gained / SCORE_SCALE, minus LIFE_PENALTY per life lost
+SCORE_SCALE = 100
+LIFE_PENALTY = 5.0
+
+# Feature vector: player fields, then the nearest asteroids
+PLAYER_FEATURES = 7
+ASTEROID_FEATURES = 6
+MAX_ASTEROID_RADIUS = 45
+
+
+class SpaceShooterEnv:
+    def __init__(self, seed=None, obs_type=OBS_FEATURES, nearest_asteroids=16,
+                 frame_size=(84, 84), frame_skip=1, max_steps=None):
+        if obs_type not in (OBS_FEATURES, OBS_FRAMES):
+            raise ValueError(f"Unknown observation type: {obs_type}")
+
+        self.game = Game(headless=True, seed=seed)
+        self.obs_type = obs_type
+        self.nearest_asteroids = nearest_asteroids
+        self.frame_size = frame_size
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+
+        # Spaces
+        self.n_actions = len(ACTIONS)
+        if obs_type == OBS_FEATURES:
+            self.observation_shape = (PLAYER_FEATURES + nearest_asteroids * ASTEROID_FEATURES,)
+            self.observation_dtype = np.float32
+        else:
+            width, height = frame_size
+            self.observation_shape = (height, width)
+            self.observation_dtype = np.uint8
+            self.frames = FrameExporter(self.game.screen, size=frame_size, grayscale=True)
+
+        # Episode bookkeeping
+        self.steps = 0
+        self.last_score = 0
+        self.last_lives = 0
+
+    def reset(self, seed=None, out=None):
+        """Start a new episode and return (observation, info)."""
+        game = self.game
+        game.reset(seed)
+        self.steps = 0
+        self.last_score = game.score
+        self.last_lives = game.player.lives
+        return self.observe(out), self.info()
+
+    def step(self, action, out=None):
+        """Hold the action's keys for frame_skip ticks.
+
+        Returns (observation, reward, terminated, truncated, info).
+        """
+        game = self.game
+        keys = ACTIONS[action]
+        for _ in range(self.frame_skip):
+            game.step(inputs=keys)
+            if game.state == GAME_OVER:
+                break
+        self.steps += 1
+
+        # Reward score gained and penalize lives lost since the last step
+        lives = game.player.lives
+        reward = (game.score - self.last_score) / SCORE_SCALE - LIFE_PENALTY * (self.last_lives - lives)
+        self.last_score = game.score
+        self.last_lives = lives
+
+        terminated = game.state == GAME_OVER
+        truncated = self.max_steps is not None and self.steps >= self.max_steps and not terminated
+        return self.observe(out), reward, terminated, truncated, self.info()
+
+    def info(self):
+        game = self.game
+        return {"score": game.score, "lives": game.player.lives, "level": game.level}
+
+    def observe(self, out=None):
+        """Write the current observation into out (allocated if None)."""
+        if out is None:
+            out = np.empty(self.observation_shape, dtype=self.observation_dtype)
+        if self.obs_type == OBS_FEATURES:
+            self.observe_features(out)
+        else:
+            self.observe_frame(out)
+        return out
+
+    def observe_features(self, out):
+        player = self.game.player
+        angle = math.radians(player.angle)
+        out[:PLAYER_FEATURES] = (
+            player.x / WINDOW_WIDTH,
+            player.y / WINDOW_HEIGHT,
+            math.sin(angle),
+            math.cos(angle),
+            player.can_shoot,
+            player.invulnerable,
+            player.lives / player.max_lives,
+        )
+
+        # Nearest asteroids relative to the player; unused slots stay zero
+        px, py = player.x, player.y
+        nearest = sorted(self.game.asteroids,
+                         key=lambda asteroid: (asteroid.x - px) ** 2 + (asteroid.y - py) ** 2)
+        out[PLAYER_FEATURES:] = 0
+        offset = PLAYER_FEATURES
+        for asteroid in nearest[:self.nearest_asteroids]:
+            out[offset:offset + ASTEROID_FEATURES] = (
+                (asteroid.x - px) / WINDOW_WIDTH,
+                (asteroid.y - py) / WINDOW_HEIGHT,
+                asteroid.dx,
+                asteroid.dy,
+                asteroid.radius / MAX_ASTEROID_RADIUS,
+                1.0,
+            )
+            offset += ASTEROID_FEATURES
+
+    def observe_frame(self, out):
+        self.game.draw()
+        self.frames.observe(out)
+
+    def close(self):
+        pass
+
+
+class SharedArray:
+    # NumPy array backed by a named shared memory block
+    def __init__(self, shape, dtype, name=None):
+        dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(shape)) * dtype.itemsize)
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.spec = (tuple(shape), dtype.str, self.shm.name)
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self.shm.buf)
+
+    @classmethod
+    def attach(cls, spec):
+        shape, dtype, name = spec
+        return cls(shape, dtype, name)
+
+    def close(self):
+        self.array = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def worker_main(connection, indices, seeds, env_kwargs, specs):
+    """Step a group of environments on commands from the parent process."""
+    buffers = {key: SharedArray.attach(spec) for key, spec in specs.items()}
+    arrays = {key: buffer.array for key, buffer in buffers.items()}
+    envs = [SpaceShooterEnv(seed=seed, **env_kwargs) for seed in seeds]
+    obs = arrays["obs"]
+
+    def write(index, reward, terminated, truncated, info):
+        arrays["rewards"][index] = reward
+        arrays["terminated"][index] = terminated
+        arrays["truncated"][index] = truncated
+        arrays["score"][index] = info["score"]
+        arrays["lives"][index] = info["lives"]
+
+    try:
+        while True:
+            command, argument = connection.recv()
+            if command == "reset":
+                for index, env in zip(indices, envs):
+                    seed = None if argument is None else argument + index
+                    _, info = env.reset(seed, out=obs[index])
+                    write(index, 0.0, False, False, info)
+            elif command == "step":
+                actions = arrays["actions"]
+                for index, env in zip(indices, envs):
+                    _, reward, terminated, truncated, info = env.step(actions[index], out=obs[index])
+                    write(index, reward, terminated, truncated, info)
+
+                    # Auto-reset; the flags above still report the finished episode
+                    if terminated or truncated:
+                        env.reset(out=obs[index])
+            elif command == "close":
+                break
+            connection.send(("ok", None))
+    except Exception:
+        connection.send(("error", traceback.format_exc()))
+    finally:
+        for env in envs:
+            env.close()
+        for buffer in buffers.values():
+            buffer.close()
+        connection.close()
+
+
+class SpaceShooterVectorEnv:
+    def __init__(self, num_envs, seed=0, num_workers=None, start_method="spawn", **env_kwargs):
+        self.num_envs = num_envs
+        self.closed = False
+
+        # Probe a local environment for the observation layout
+        probe = SpaceShooterEnv(**env_kwargs)
+        self.n_actions = probe.n_actions
+        self.observation_shape = probe.observation_shape
+        self.observation_dtype = probe.observation_dtype
+        probe.close()
+
+        # Shared buffers, one row per environment
+        self.buffers = {
+            "obs": SharedArray((num_envs,) + self.observation_shape, self.observation_dtype),
+            "actions": SharedArray((num_envs,), np.int32),
+            "rewards": SharedArray((num_envs,), np.float32),
+            "terminated": SharedArray((num_envs,), np.bool_),
+            "truncated": SharedArray((num_envs,), np.bool_),
+            "score": SharedArray((num_envs,), np.int64),
+            "lives": SharedArray((num_envs,), np.int32),
+        }
+        specs = {key: buffer.spec for key, buffer in self.buffers.items()}
+
+        # Split the environments evenly over the workers
+        context = multiprocessing.get_context(start_method)
+        num_workers = min(num_envs, num_workers or context.cpu_count())
+        self.connections = []
+        self.processes = []
+        for worker in range(num_workers):
+            indices = list(range(worker, num_envs, num_workers))
+            seeds = [seed + index for index in indices]
+            parent, child = context.Pipe()
+            process = context.Process(target=worker_main,
+                                      args=(child, indices, seeds, env_kwargs, specs),
+                                      daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def array(self, key):
+        return self.buffers[key].array
+
+    def call(self, command, argument=None):
+        for connection in self.connections:
+            connection.send((command, argument))
+        for connection in self.connections:
+            status, error = connection.recv()
+            if status == "error":
+                raise RuntimeError(f"Environment worker failed:\n{error}")
+
+    def reset(self, seed=None):
+        """Reset every environment and return the observation array.
+
+        Returned arrays are views of the shared buffers and are overwritten
+        by the next call; copy them to keep them.
+        """
+        self.call("reset", seed)
+        return self.array("obs")
+
+    def step(self, actions):
+        """Step every environment; finished episodes restart automatically.
+
+        Returns (observations, rewards, terminated, truncated, info).
+        """
+        self.array("actions")[:] = actions
+        self.call("step")
+        info = {"score": self.array("score"), "lives": self.array("lives")}
+        return (self.array("obs"), self.array("rewards"), self.array("terminated"),
+                self.array("truncated"), info)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        for connection in self.connections:
+            try:
+                connection.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for connection in self.connections:
+            connection.close()
+        for buffer in self.buffers.values():
+            buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
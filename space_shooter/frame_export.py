@@ -0,0 +1,88 @@
+"""Zero-copy NumPy access to rendered frames.
+
+pygame.surfarray.pixels3d() returns an array that shares memory with the
+surface, so reading the framebuffer costs nothing compared to
+pygame.image.tobytes(). A pixel view keeps the surface locked for as long
+as any array refers to it, and a locked surface cannot be drawn on, so
+views are only passed to a callback (with_pixels, with_alpha). The
+callback must not return or store the view; copy what it needs to keep.
+
+Observation buffers (optionally downscaled and/or grayscale) are
+allocated once and overwritten on every call.
+"""
+import numpy as np
+import pygame
+
+# Integer ITU-R BT.601 luma weights, summing to 256
+GRAY_WEIGHTS = (77, 150, 29)
+
+
+class FrameExporter:
+    def __init__(self, surface, size=None, grayscale=False):
+        self.surface = surface
+        self.grayscale = grayscale
+
+        # Downscaled copies are rendered into a reused surface of the same format
+        self.size = tuple(size) if size else surface.get_size()
+        self.scaled = pygame.Surface(self.size, 0, surface) if size else None
+
+        # Reused observation buffers, rows first
+        width, height = self.size
+        if grayscale:
+            self.shape = (height, width)
+            self.accum = np.empty(self.shape, dtype=np.uint16)
+            self.term = np.empty(self.shape, dtype=np.uint16)
+        else:
+            self.shape = (height, width, 3)
+        self.buffer = np.empty(self.shape, dtype=np.uint8)
+
+    def with_pixels(self, fn):
+        """Return fn(view) for a (height, width, 3) view of the surface, without copying."""
+        return self.call_with_view(fn, pygame.surfarray.pixels3d, (1, 0, 2))
+
+    def with_alpha(self, fn):
+        """Return fn(view) for a (height, width) view of the per-pixel alpha channel."""
+        return self.call_with_view(fn, pygame.surfarray.pixels_alpha, (1, 0))
+
+    def call_with_view(self, fn, make_view, axes):
+        view = make_view(self.surface)
+        try:
+            result = fn(view.transpose(axes))
+        finally:
+            del view
+        if self.surface.get_locked():
+            raise RuntimeError("A pixel view outlived the callback and keeps the surface locked; "
+                               "copy the data (e.g. view.copy()) instead of returning or storing the view")
+        return result
+
+    def observe(self, out=None):
+        """Write the current frame into out (the reused buffer if None)."""
+        if out is None:
+            out = self.buffer
+
+        source = self.surface
+        if self.scaled is not None:
+            pygame.transform.scale(source, self.size, self.scaled)
+            source = self.scaled
+
+        view = pygame.surfarray.pixels3d(source)
+        rgb = view.transpose(1, 0, 2)
+        if self.grayscale:
+            self.to_gray(rgb, out)
+        else:
+            # Per-channel copies avoid numpy's slow path for the reversed channel stride
+            for channel in range(3):
+                np.copyto(out[..., channel], rgb[..., channel])
+        del rgb, view
+        return out
+
+    def to_gray(self, rgb, out):
+        # (77 R + 150 G + 29 B) >> 8 in reused uint16 buffers
+        accum, term = self.accum, self.term
+        red, green, blue = GRAY_WEIGHTS
+        np.multiply(rgb[..., 0], red, out=accum, dtype=np.uint16)
+        np.multiply(rgb[..., 1], green, out=term, dtype=np.uint16)
+        accum += term
+        np.multiply(rgb[..., 2], blue, out=term, dtype=np.uint16)
+        accum += term
+        np.right_shift(accum, 8, out=out, casting="unsafe")
@@ -0,0 +1,91 @@
+"""Per-phase frame timing with rolling percentiles and CSV export.
+
+The game calls mark(phase) as each phase of a frame finishes; the time
+since the previous mark is charged to that phase. The last `window`
+frames are kept in ring buffers for p50/p95/p99, and every frame can be
+streamed to a CSV file. Games without a profiler skip all of this behind
+a single `is not None` check per phase.
+"""
+import csv
+import time
+from array import array
+
+from stats import percentile
+
+PHASES = (
+    "events", "player", "bullets", "asteroids", "collisions", "spawning",
+    "background", "entities", "hud", "flip",
+)
+
+# CSV rows are flushed to disk this often
+CSV_FLUSH_FRAMES = 60
+
+
+class FrameProfiler:
+    def __init__(self, window=600, csv_path=None):
+        self.window = window
+
+        # Ring buffers of per-frame seconds, one per phase plus the total
+        self.samples = {phase: array("d", bytes(8 * window)) for phase in PHASES + ("frame",)}
+        self.index = 0
+        self.count = 0
+        self.frames = 0
+
+        # Seconds charged to each phase in the current frame
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.frame_start = self.last = time.perf_counter()
+
+        # Optional per-frame CSV stream
+        self.file = open(csv_path, "w", newline="") if csv_path else None
+        self.writer = csv.writer(self.file) if self.file else None
+        if self.writer:
+            self.writer.writerow(("frame",) + tuple(f"{phase}_ms" for phase in PHASES) + ("frame_ms",))
+
+    def begin_frame(self):
+        current = self.current
+        for phase in PHASES:
+            current[phase] = 0.0
+        self.frame_start = self.last = time.perf_counter()
+
+    def mark(self, phase):
+        """Charge the time since the previous mark to phase."""
+        now = time.perf_counter()
+        self.current[phase] += now - self.last
+        self.last = now
+
+    def skip(self):
+        """Leave the time since the previous mark out of every phase."""
+        self.last = time.perf_counter()
+
+    def end_frame(self):
+        index = self.index
+        samples = self.samples
+        current = self.current
+        for phase in PHASES:
+            samples[phase][index] = current[phase]
+        total = sum(current.values())
+        samples["frame"][index] = total
+
+        self.index = (index + 1) % self.window
+        self.count = min(self.count + 1, self.window)
+        self.frames += 1
+
+        if self.writer:
+            self.writer.writerow([self.frames] + [round(current[phase] * 1000, 4) for phase in PHASES] +
+                                 [round(total * 1000, 4)])
+            if self.frames % CSV_FLUSH_FRAMES == 0:
+                self.file.flush()
+
+    def percentiles(self):
+        """Return {phase: (p50, p95, p99)} in milliseconds over the window."""
+        result = {}
+        for phase, values in self.samples.items():
+            recent = sorted(values[:self.count]) or [0.0]
+            result[phase] = tuple(percentile(recent, fraction) * 1000 for fraction in (0.5, 0.95, 0.99))
+        return result
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+            self.writer = None
@@ -0,0 +1,35 @@
+"""Rendered-template cache for pages whose output does not vary per request.
+
+The template is rendered once and kept, with a gzip copy, as a
+StaticAsset, so requests are answered without any Jinja work: a strong
+ETag, 304s for If-None-Match, and the precompressed body for clients
+that accept it. The template file's mtime is checked on each request,
+so edits show up without a restart.
+"""
+import hashlib
+import os
+
+from flask import render_template
+
+from static_assets import REVALIDATE, StaticAsset
+
+
+class RenderedPage:
+    def __init__(self, app, template):
+        self.template = template
+        self.path = os.path.join(app.root_path, app.template_folder, template)
+        self.mtime = None
+        self.asset = None
+
+    def current(self):
+        """Return the cached page, re-rendering it if the template changed."""
+        mtime = os.stat(self.path).st_mtime_ns
+        if mtime != self.mtime:
+            body = render_template(self.template).encode("utf-8")
+            self.asset = StaticAsset(self.template, body, digest=hashlib.sha256(body).hexdigest())
+            self.mtime = mtime
+        return self.asset
+
+    def response(self, request):
+        # Browsers revalidate every time; unchanged pages cost a 304
+        return self.current().respond(request, REVALIDATE)
@@ -0,0 +1,54 @@
+"""Free-list object pools for short-lived game entities.
+
+Pooled classes expose reset() with the same arguments as their
+constructor, so a recycled instance ends up in the same state as a new one.
+"""
+
+
+class ObjectPool:
+    def __init__(self, factory):
+        # Class (or callable) used when the free list is empty
+        self.factory = factory
+        self.free = []
+
+        # Counters
+        self.created = 0
+        self.reused = 0
+        self.in_use = 0
+        self.high_water = 0
+
+    def acquire(self, *args, **kwargs):
+        """Return a recycled instance reset with args, or a new one."""
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.factory(*args, **kwargs)
+            self.created += 1
+
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        """Return an instance to the free list."""
+        self.in_use -= 1
+        self.free.append(obj)
+
+    def release_all(self, objs):
+        for obj in objs:
+            self.release(obj)
+
+    def stats(self):
+        """Return allocation counters, high-water mark and reuse rate."""
+        acquired = self.created + self.reused
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "in_use": self.in_use,
+            "free": len(self.free),
+            "high_water": self.high_water,
+            "reuse_rate": self.reused / acquired if acquired else 0.0,
+        }
@@ -0,0 +1,213 @@
+"""Compact replay recording and headless playback.
+
+A replay stores the game's seed and settings, one input byte per tick and
+a keyframe of the full game state every keyframe_interval ticks. The file
+is written as a stream of independently zlib-compressed chunks. Each
+chunk starts with a keyframe, so a crashed session loses at most one chunk
+and seeking only decompresses the chunk containing the target tick.
+Keyframes are exact (unquantized) game snapshots.
+
+File layout:
+    magic b"SSREPLAY", u32 header length, JSON header
+    repeated: u32 compressed length, zlib(chunk)
+    chunk: u32 start tick, u32 keyframe length, keyframe, input bytes
+"""
+import json
+import struct
+import time
+import zlib
+
+import pygame
+
+from snapshot import restore_snapshot, take_snapshot
+
+REPLAY_MAGIC = b"SSREPLAY"
+REPLAY_FORMAT_VERSION = 1
+
+# Input bitmask, one byte per tick
+INPUT_BITS = (
+    (pygame.K_LEFT, 1 << 0),
+    (pygame.K_RIGHT, 1 << 1),
+    (pygame.K_UP, 1 << 2),
+    (pygame.K_DOWN, 1 << 3),
+    (pygame.K_a, 1 << 4),
+    (pygame.K_d, 1 << 5),
+    (pygame.K_SPACE, 1 << 6),
+)
+SHOOT_PRESSED = 1 << 7  # SPACE KEYDOWN event handled this tick
+
+
+def encode_inputs(keys, shoot_pressed=False):
+    """Pack a keyboard state into one byte."""
+    mask = SHOOT_PRESSED if shoot_pressed else 0
+    for key, bit in INPUT_BITS:
+        if keys[key]:
+            mask |= bit
+    return mask
+
+
+def decode_inputs(mask):
+    """Return (pressed key codes, shoot_pressed) for an input byte."""
+    pressed = [key for key, bit in INPUT_BITS if mask & bit]
+    return pressed, bool(mask & SHOOT_PRESSED)
+
+
+class ReplayWriter:
+    def __init__(self, path, game, keyframe_interval=600):
+        self.path = path
+        self.game = game
+        self.keyframe_interval = keyframe_interval
+        self.tick = 0
+
+        # Settings needed to rebuild an identical game for playback
+        header = {
+            "version": REPLAY_FORMAT_VERSION,
+            "seed": game.seed,
+            "fps": 1000 / game.tick_ms,
+            "tick_ms": game.tick_ms,
+            "keyframe_interval": keyframe_interval,
+            "asteroid_variants": game.asteroid_variants,
+            "asteroid_bank_seed": game.asteroid_bank_seed,
+            "difficulty": game.difficulty.as_dict(),
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        header_bytes = json.dumps(header).encode("utf-8")
+        self.file = open(path, "wb")
+        self.file.write(REPLAY_MAGIC)
+        self.file.write(struct.pack("<I", len(header_bytes)))
+        self.file.write(header_bytes)
+        self.start_chunk()
+
+    def start_chunk(self):
+        self.chunk_start = self.tick
+        self.keyframe = take_snapshot(self.game, quantize=False)
+        self.inputs = bytearray()
+
+    def flush_chunk(self):
+        chunk = struct.pack("<II", self.chunk_start, len(self.keyframe)) + self.keyframe + bytes(self.inputs)
+        compressed = zlib.compress(chunk)
+        self.file.write(struct.pack("<I", len(compressed)))
+        self.file.write(compressed)
+        self.file.flush()
+
+    def record(self, mask):
+        """Append the inputs of one simulated tick."""
+        self.inputs.append(mask)
+        self.tick += 1
+        if self.tick - self.chunk_start >= self.keyframe_interval:
+            self.flush_chunk()
+            self.start_chunk()
+
+    def close(self):
+        if self.file is None:
+            return
+        if self.inputs:
+            self.flush_chunk()
+        self.file.close()
+        self.file = None
+
+
+class ReplayChunk:
+    def __init__(self, start_tick, keyframe, inputs):
+        self.start_tick = start_tick
+        self.keyframe = keyframe
+        self.inputs = inputs
+
+
+class ReplayReader:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(REPLAY_MAGIC):
+            raise ValueError(f"Not a replay file: {path}")
+
+        offset = len(REPLAY_MAGIC)
+        (header_length,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        self.header = json.loads(data[offset:offset + header_length].decode("utf-8"))
+        if self.header["version"] != REPLAY_FORMAT_VERSION:
+            raise ValueError(f"Unsupported replay version: {self.header['version']}")
+        offset += header_length
+
+        # Index chunks without decompressing them
+        self.data = data
+        self.chunk_offsets = []
+        while offset + 4 <= len(data):
+            (length,) = struct.unpack_from("<I", data, offset)
+            if offset + 4 + length > len(data):
+                break  # Truncated final chunk from an interrupted session
+            self.chunk_offsets.append((offset + 4, length))
+            offset += 4 + length
+
+    def __len__(self):
+        return len(self.chunk_offsets)
+
+    def chunk(self, index):
+        offset, length = self.chunk_offsets[index]
+        chunk = zlib.decompress(self.data[offset:offset + length])
+        start_tick, keyframe_length = struct.unpack_from("<II", chunk, 0)
+        keyframe = chunk[8:8 + keyframe_length]
+        return ReplayChunk(start_tick, keyframe, chunk[8 + keyframe_length:])
+
+    def chunks(self):
+        for index in range(len(self)):
+            yield self.chunk(index)
+
+    @property
+    def tick_count(self):
+        if not self.chunk_offsets:
+            return 0
+        last = self.chunk(len(self) - 1)
+        return last.start_tick + len(last.inputs)
+
+    def make_game(self, game_class=None, difficulty_class=None, **kwargs):
+        """Create a headless game configured like the recorded one.
+
+        space_shooter.py passes its own Game and Difficulty; importing them
+        here would load a second copy when it runs as __main__.
+        """
+        if game_class is None or difficulty_class is None:
+            from space_shooter import Difficulty, Game
+            game_class = game_class or Game
+            difficulty_class = difficulty_class or Difficulty
+
+        header = self.header
+        return game_class(headless=True, seed=header["seed"],
+                          asteroid_variants=header["asteroid_variants"],
+                          asteroid_bank_seed=header["asteroid_bank_seed"],
+                          difficulty=difficulty_class(**header.get("difficulty", {})), **kwargs)
+
+    def seek(self, game, tick):
+        """Restore the game to the state after the given tick."""
+        # Every chunk but the last holds exactly keyframe_interval ticks
+        index = min(tick // self.header["keyframe_interval"], len(self) - 1)
+        chunk = self.chunk(index)
+        self.check_tick(game)
+        restore_snapshot(game, chunk.keyframe)
+        for mask in chunk.inputs[:tick - chunk.start_tick]:
+            self.apply(game, mask)
+
+    def apply(self, game, mask):
+        pressed, shoot_pressed = decode_inputs(mask)
+        game.step(pressed, shoot_pressed=shoot_pressed)
+
+    def check_tick(self, game):
+        # Game.step always advances one tick_ms, so it must match the recording
+        if game.tick_ms != self.header["tick_ms"]:
+            raise ValueError(f"Replay was recorded at {self.header['tick_ms']:g} ms per tick, "
+                             f"the game runs at {game.tick_ms:g}")
+
+    def play(self, game, verify=True, render=False):
+        """Run every recorded tick; optionally check each keyframe matches."""
+        self.check_tick(game)
+        first = True
+        for chunk in self.chunks():
+            if first:
+                restore_snapshot(game, chunk.keyframe)
+                first = False
+            elif verify and take_snapshot(game, quantize=False) != chunk.keyframe:
+                raise ValueError(f"Replay desynchronized before tick {chunk.start_tick}")
+            for mask in chunk.inputs:
+                pressed, shoot_pressed = decode_inputs(mask)
+                game.step(pressed, render=render, shoot_pressed=shoot_pressed)
+        return game
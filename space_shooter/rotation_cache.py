@@ -0,0 +1,120 @@
+"""Shared cache of pre-rotated sprite surfaces.
+
+Angles are quantized to a fixed step so sprites that rotate continuously
+reuse a small set of rotated surfaces instead of calling
+pygame.transform.rotate every frame.
+"""
+from collections import OrderedDict
+
+import pygame
+
+
+class RotationCache:
+    def __init__(self, step=2, max_entries=1024):
+        # Angle quantization (degrees per cached frame)
+        self.step = step
+        self.steps_per_turn = int(round(360 / step))
+
+        # LRU storage: (base image, angle index) -> (surface, offset)
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.keys_by_image = {}
+
+        # Counters for tuning memory against frame time
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def quantize(self, angle):
+        """Return the cache index for an angle in degrees."""
+        return int(round(angle / self.step)) % self.steps_per_turn
+
+    def is_step(self, angle):
+        """True if angle falls exactly on one of the cached angles."""
+        return abs(angle / self.step - round(angle / self.step)) < 1e-9
+
+    def get(self, image, angle):
+        """Return (rotated surface, offset from center to topleft)."""
+        key = (image, self.quantize(angle))
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry
+
+        # Rotate once and remember the offset so callers can place the
+        # surface without building a new rect
+        self.misses += 1
+        rotated = pygame.transform.rotate(image, key[1] * self.step)
+        return self.put(image, key[1] * self.step, rotated)
+
+    def put(self, image, angle, rotated):
+        """Store a rotated surface, e.g. a pre-rotated atlas frame, and return its entry.
+
+        Frames rotated elsewhere must be at a multiple of step, or they would
+        stand in for every angle that quantizes to the same index.
+        """
+        if not self.is_step(angle):
+            raise ValueError(f"Rotation of {angle:g} degrees is not a multiple of "
+                             f"the {self.step:g} degree cache step")
+        key = (image, self.quantize(angle))
+        offset = (-(rotated.get_width() // 2), -(rotated.get_height() // 2))
+        entry = (rotated, offset)
+        self.entries[key] = entry
+        self.keys_by_image.setdefault(image, set()).add(key)
+
+        # Evict least recently used frames
+        if len(self.entries) > self.max_entries:
+            old_key, _ = self.entries.popitem(last=False)
+            self._forget(old_key)
+            self.evictions += 1
+
+        return entry
+
+    def rotate(self, image, angle, center):
+        """Return a rotated surface and its rect centered on center."""
+        rotated, offset = self.get(image, angle)
+        rect = rotated.get_rect()
+        rect.topleft = (int(center[0]) + offset[0], int(center[1]) + offset[1])
+        return rotated, rect
+
+    def _forget(self, key):
+        keys = self.keys_by_image.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.keys_by_image[key[0]]
+
+    def discard(self, image):
+        """Drop every cached frame of a base image."""
+        for key in self.keys_by_image.pop(image, ()):
+            del self.entries[key]
+
+    def clear(self):
+        self.entries.clear()
+        self.keys_by_image.clear()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self):
+        """Return cache size and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "step": self.step,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared by every sprite in the game
+rotation_cache = RotationCache()
@@ -1,28 +1,48 @@
-import os
-import pygame
+"""Generate the sprite PNGs and texture atlas in static/ incrementally.
+
+Every output has a recipe: its generator, the source of the code it uses and
+the parameters (including the random seed) it is drawn with. The recipe
+hash and the hash of the written file are kept in asset_manifest.json;
+outputs whose recipe is unchanged and whose file is intact are skipped,
+and the rest are drawn in parallel in a process pool. When nothing
+changed the script exits without importing pygame, so deploys and
+container starts can run it unconditionally:
+
+    python setup_assets.py            # rebuild what changed
+    python setup_assets.py --force    # rebuild everything
+
+atlas.png and atlas.json pack the ship, bullet and asteroid variants
+into one sheet for both clients; see atlas.py.
+"""
+import argparse
+import hashlib
+import inspect
+import json
 import math
+import os
 import random
+from concurrent.futures import ProcessPoolExecutor
+
+from tracing import trace_from_environment, traced
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_PATH = os.path.join(BASE_DIR, 'asset_manifest.json')
+
+@traced(cat="assets")
 def create_directories():
     """Create the necessary directories for the game assets."""
-    # Get the base directory
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    
     # Create static directory if it doesn't exist
-    static_dir = os.path.join(base_dir, 'static')
+    static_dir = os.path.join(BASE_DIR, 'static')
     if not os.path.exists(static_dir):
         os.makedirs(static_dir)
         print(f"Created directory: {static_dir}")
     
     return static_dir
 
-def create_player_ship(static_dir):
-    """Create a player ship image and save it to the assets directory."""
-    # Initialize Pygame
-    pygame.init()
-    
-    # Set dimensions for the ship image
-    width, height = 50, 50
+def draw_player_ship(width=50, height=50):
+    """Draw the player ship and return the surface."""
+    # Imported here so up-to-date runs never load pygame
+    import pygame
     
     # Create a surface for the ship
     ship_surface = pygame.Surface((width, height), pygame.SRCALPHA)
@@ -38,7 +58,7 @@ def create_player_ship(static_dir):
     
     # Cockpit (small circle near the top)
     cockpit_color = (220, 240, 255)  # Very light blue
-    pygame.draw.circle(ship_surface, cockpit_color, 
+    pygame.draw.circle(ship_surface, cockpit_color,
                       (width//2, height//3), width//10)
     
     # Wings
@@ -50,18 +70,22 @@ def create_player_ship(static_dir):
     
     # Engine
     engine_color = (200, 200, 200)  # Silver
-    pygame.draw.rect(ship_surface, engine_color, 
+    pygame.draw.rect(ship_surface, engine_color,
                     (width//3, height-12, width//3, 7))
     
-    # Save the image
-    ship_path = os.path.join(static_dir, 'player_ship.png')
-    pygame.image.save(ship_surface, ship_path)
-    print(f"Created player ship image: {ship_path}")
+    return ship_surface
+
+@traced(cat="assets")
+def create_player_ship(path, width=50, height=50):
+    """Draw the player ship image and save it to path."""
+    import pygame
+    
+    pygame.image.save(draw_player_ship(width, height), path)
 
-def create_asteroid(static_dir):
-    """Create an asteroid image and save it to the assets directory."""
-    # Set dimensions
-    size = 50
+@traced(cat="assets")
+def create_asteroid(path, size=50, point_count=10, craters=3, seed=0):
+    """Draw an asteroid image and save it to path."""
+    import pygame
     
     # Create a surface for the asteroid
     asteroid_surface = pygame.Surface((size, size), pygame.SRCALPHA)
@@ -72,13 +96,12 @@ def create_asteroid(static_dir):
     # Create an irregular polygon
     points = []
     radius = size // 2
-    point_count = 10
     
     for i in range(point_count):
         angle = (i / point_count) * (2 * 3.14159)  # Use radians
         # Add some randomness to the radius
         var_radius = radius * (0.8 + 0.4 * (i / point_count))
-        
+    
         x = radius + var_radius * math.cos(angle)
         y = radius + var_radius * math.sin(angle)
         points.append((x, y))
@@ -86,52 +109,150 @@ def create_asteroid(static_dir):
     # Draw the asteroid
     pygame.draw.polygon(asteroid_surface, base_color, points)
     
-    # Add some texture/craters
+    # Add some texture/craters, seeded so the output is reproducible
     crater_color = (100, 100, 100)  # Darker grey
-    import random
-    for _ in range(3):
-        cx = random.randint(0, size)
-        cy = random.randint(0, size)
-        crater_radius = random.randint(2, 7)
+    rng = random.Random(seed)
+    for _ in range(craters):
+        cx = rng.randint(0, size)
+        cy = rng.randint(0, size)
+        crater_radius = rng.randint(2, 7)
         pygame.draw.circle(asteroid_surface, crater_color, (cx, cy), crater_radius)
     
     # Save the image
-    asteroid_path = os.path.join(static_dir, 'asteroid.png')
-    pygame.image.save(asteroid_surface, asteroid_path)
-    print(f"Created asteroid image: {asteroid_path}")
+    pygame.image.save(asteroid_surface, path)
 
-def create_bullet(static_dir):
-    """Create a bullet image and save it to the assets directory."""
+def draw_bullet(radius=3):
+    """Draw a bullet and return the surface."""
+    import pygame
+    
     # Create a surface for the bullet
-    bullet_surface = pygame.Surface((6, 6), pygame.SRCALPHA)
+    bullet_surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
     
     # Draw a yellow circle
-    pygame.draw.circle(bullet_surface, (255, 255, 100), (3, 3), 3)
+    pygame.draw.circle(bullet_surface, (255, 255, 100), (radius, radius), radius)
     
     # Add a white core for glow effect
-    pygame.draw.circle(bullet_surface, (255, 255, 255), (3, 3), 1)
+    pygame.draw.circle(bullet_surface, (255, 255, 255), (radius, radius), radius // 3)
     
-    # Save the image
-    bullet_path = os.path.join(static_dir, 'bullet.png')
-    pygame.image.save(bullet_surface, bullet_path)
-    print(f"Created bullet image: {bullet_path}")
+    return bullet_surface
 
-def main():
-    """Set up all game assets."""
-    # Initialize pygame
-    pygame.init()
+@traced(cat="assets")
+def create_bullet(path, radius=3):
+    """Draw a bullet image and save it to path."""
+    import pygame
+    
+    pygame.image.save(draw_bullet(radius), path)
+
+@traced(cat="assets")
+def create_atlas(path, variants_per_size=8, seed=0, rotation_step=0):
+    """Pack every sprite into one PNG at path plus a Phaser frame map next to it."""
+    # The game's variant bank, drawn from the same seed as Game's default
+    from asteroid_bank import AsteroidBank
+    from atlas import build_atlas, save_atlas, sprite_frames
+    
+    bank = AsteroidBank.generate(variants_per_size, seed)
+    frames, meta = sprite_frames(draw_player_ship(), draw_bullet(), bank, rotation_step)
+    sheet, document = build_atlas(frames, meta=meta, image_name=os.path.basename(path))
+    save_atlas(sheet, document, path)
+
+# Output name -> (generator, parameters, extra code whose source is part of the recipe)
+RECIPES = {
+    'player_ship.png': (create_player_ship, {'width': 50, 'height': 50}, [draw_player_ship]),
+    'asteroid.png': (create_asteroid, {'size': 50, 'point_count': 10, 'craters': 3, 'seed': 0}, []),
+    'bullet.png': (create_bullet, {'radius': 3}, [draw_bullet]),
+    'atlas.png': (create_atlas, {'variants_per_size': 8, 'seed': 0, 'rotation_step': 0},
+                  [draw_player_ship, draw_bullet, 'asteroid_bank', 'atlas']),
+}
+
+# Files written alongside an output, checked and hashed with it
+COMPANIONS = {
+    'atlas.png': ['atlas.json'],
+}
+
+def source_of(code):
+    # Module names are read from disk so pygame stays unloaded on up-to-date runs
+    if isinstance(code, str):
+        with open(os.path.join(BASE_DIR, code + '.py')) as f:
+            return f.read()
+    return inspect.getsource(code)
+
+def recipe_hash(name):
+    """Hash everything that determines an output: generator code and parameters."""
+    generator, params, sources = RECIPES[name]
+    recipe = {
+        'output': name,
+        'generator': generator.__name__,
+        'source': [source_of(code) for code in [generator] + sources],
+        'params': params,
+    }
+    return hashlib.sha256(json.dumps(recipe, sort_keys=True).encode()).hexdigest()
+
+def output_paths(name, static_dir):
+    return [os.path.join(static_dir, output) for output in [name] + COMPANIONS.get(name, [])]
+
+def file_hash(paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def save_manifest(manifest):
+    with open(MANIFEST_PATH + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(MANIFEST_PATH + '.tmp', MANIFEST_PATH)
+
+def is_current(name, static_dir, entry):
+    """True if the recorded recipe matches and the file on disk is the one it produced."""
+    paths = output_paths(name, static_dir)
+    return (entry is not None and entry['recipe'] == recipe_hash(name)
+            and all(os.path.exists(path) for path in paths) and file_hash(paths) == entry['sha256'])
+
+def build_asset(name, static_dir):
+    """Generate one output; runs in a worker process. Returns its manifest entry."""
+    generator, params, _ = RECIPES[name]
+    generator(os.path.join(static_dir, name), **params)
+    return {'recipe': recipe_hash(name), 'sha256': file_hash(output_paths(name, static_dir))}
+
+@traced(cat="assets")
+def main(argv=None):
+    """Set up all game assets, rebuilding only what changed."""
+    parser = argparse.ArgumentParser(description="Generate the sprite PNGs in static/.")
+    parser.add_argument('--force', action='store_true', help="Rebuild every asset")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help="Worker processes")
+    args = parser.parse_args(argv)
     
     # Create directories
     static_dir = create_directories()
     
-    # Create assets
-    create_player_ship(static_dir)
-    create_asteroid(static_dir)
-    create_bullet(static_dir)
+    manifest = load_manifest()
+    stale = [name for name in RECIPES
+             if args.force or not is_current(name, static_dir, manifest.get(name))]
+    if not stale:
+        print("Assets up to date")
+        return
+    
+    # Independent assets are drawn in parallel; a lone one skips the pool start-up
+    if len(stale) == 1 or args.jobs <= 1:
+        entries = [build_asset(name, static_dir) for name in stale]
+    else:
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(stale))) as pool:
+            entries = list(pool.map(build_asset, stale, [static_dir] * len(stale)))
     
-    # Cleanup
-    pygame.quit()
+    for name, entry in zip(stale, entries):
+        manifest[name] = entry
+        print(f"Created {name}")
+    save_manifest(manifest)
     print("Asset setup complete!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    trace_from_environment()
+    main()
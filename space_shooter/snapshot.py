@@ -0,0 +1,268 @@
+"""Compact binary snapshots of a running Game.
+
+A snapshot packs everything the simulation depends on (state, score,
+level, timers, both RNG streams, the player, asteroids and bullets) into
+fixed-size struct records, so taking or restoring one costs microseconds.
+Uses include save states, rollback and crash recovery.
+
+Floats are stored as 1/1024 fixed point by default. Snapshots taken with
+quantize=False keep full doubles, so a restored game continues exactly as
+the original would have; replay keyframes use those. Asteroid images are
+stored as bank variant ids, never as pixels. Packing a restored game gives
+back the same bytes.
+
+Layout (little endian):
+    header: magic, version, flags, state, score, high score, level,
+            clock ticks, spawn timer, asteroid count, bullet count
+    two RNG streams: version, gauss flag, gauss value, 625 state words
+    player record, asteroid records, bullet records
+"""
+import random
+import struct
+
+from rotation_cache import rotation_cache
+
+SNAPSHOT_MAGIC = b"SSNP"
+SNAPSHOT_VERSION = 1
+
+# Header flags
+FLAG_QUANTIZED = 1
+
+# Fixed-point steps per unit. A power of two keeps int -> float -> int exact
+FIXED_POINT_SCALE = 1024
+
+HEADER = struct.Struct("<4sBBBIIIdiII")
+RNG_HEADER = struct.Struct("<B?d")
+RNG_WORDS = struct.Struct("<625I")
+RNG_SIZE = RNG_HEADER.size + RNG_WORDS.size
+
+
+class SnapshotCodec:
+    def __init__(self, quantize=True):
+        self.quantize = quantize
+        self.flags = FLAG_QUANTIZED if quantize else 0
+
+        # Records with the float fields first
+        real = "i" if quantize else "d"
+        self.player_record = struct.Struct("<" + real * 5 + "??ib?i?")
+        self.asteroid_record = struct.Struct("<" + real * 7 + "BBh")
+        self.bullet_record = struct.Struct("<" + real * 6 + "i")
+
+        # Reused output buffer, grown to the largest snapshot seen
+        self.buffer = bytearray()
+
+        # Resets newly pooled asteroids without consuming the game's streams
+        self.scratch_rng = random.Random(0)
+
+    def size(self, game):
+        """Return the snapshot size in bytes for the game's current entities."""
+        return (HEADER.size + 2 * RNG_SIZE + self.player_record.size +
+                len(game.asteroids) * self.asteroid_record.size +
+                len(game.bullets) * self.bullet_record.size)
+
+    def pack(self, game):
+        """Return the game's state as bytes."""
+        if game.store is not None:
+            raise ValueError("Snapshots are not supported with the entity store")
+
+        size = self.size(game)
+        buffer = self.buffer
+        if len(buffer) < size:
+            buffer.extend(bytes(size - len(buffer)))
+
+        # Header
+        timer = game.timer
+        ticks = timer.ticks if hasattr(timer, "ticks") else timer.get_ticks()
+        HEADER.pack_into(buffer, 0, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.flags, game.state,
+                         game.score, game.high_score, game.level, ticks,
+                         game.asteroid_spawn_timer, len(game.asteroids), len(game.bullets))
+        offset = HEADER.size
+
+        # RNG streams
+        for rng in (game.spawn_rng, game.asteroid_rng):
+            version, words, gauss_next = rng.getstate()
+            RNG_HEADER.pack_into(buffer, offset, version, gauss_next is not None, gauss_next or 0.0)
+            RNG_WORDS.pack_into(buffer, offset + RNG_HEADER.size, *words)
+            offset += RNG_SIZE
+
+        quantize = self.quantize
+        scale = FIXED_POINT_SCALE
+
+        # Player
+        player = game.player
+        if quantize:
+            real = (int(player.x * scale), int(player.y * scale), int(player.angle % 360 * scale),
+                    int(player.dx * scale), int(player.dy * scale))
+        else:
+            real = (player.x, player.y, player.angle, player.dx, player.dy)
+        self.player_record.pack_into(buffer, offset, *real,
+                                     player.thruster_active, player.can_shoot, player.last_shot_time,
+                                     player.lives, player.invulnerable, player.invulnerable_time,
+                                     player.visible)
+        offset += self.player_record.size
+
+        # Asteroids, with -1 for shapes that are not in the bank
+        pack_asteroid = self.asteroid_record.pack_into
+        step = self.asteroid_record.size
+        for asteroid in game.asteroids:
+            variant_id = asteroid.variant_id
+            if quantize:
+                pack_asteroid(buffer, offset,
+                              int(asteroid.x * scale), int(asteroid.y * scale),
+                              int(asteroid.dx * scale), int(asteroid.dy * scale),
+                              int(asteroid.speed * scale), int(asteroid.rotation % 360 * scale),
+                              int(asteroid.rotation_speed * scale),
+                              asteroid.size, asteroid.radius, -1 if variant_id is None else variant_id)
+            else:
+                pack_asteroid(buffer, offset,
+                              asteroid.x, asteroid.y, asteroid.dx, asteroid.dy,
+                              asteroid.speed, asteroid.rotation, asteroid.rotation_speed,
+                              asteroid.size, asteroid.radius, -1 if variant_id is None else variant_id)
+            offset += step
+
+        # Bullets
+        pack_bullet = self.bullet_record.pack_into
+        step = self.bullet_record.size
+        for bullet in game.bullets:
+            if quantize:
+                pack_bullet(buffer, offset,
+                            int(bullet.x * scale), int(bullet.y * scale), int(bullet.angle * scale),
+                            int(bullet.speed * scale), int(bullet.dx * scale), int(bullet.dy * scale),
+                            bullet.creation_time)
+            else:
+                pack_bullet(buffer, offset, bullet.x, bullet.y, bullet.angle,
+                            bullet.speed, bullet.dx, bullet.dy, bullet.creation_time)
+            offset += step
+
+        return bytes(memoryview(buffer)[:size])
+
+    def restore(self, game, data):
+        """Load a snapshot taken by pack() into game, reusing its entities."""
+        if game.store is not None:
+            raise ValueError("Snapshots are not supported with the entity store")
+        (magic, version, flags, state, score, high_score, level, ticks,
+         spawn_timer, asteroid_count, bullet_count) = HEADER.unpack_from(data, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Not a game snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {version}")
+        if flags & FLAG_QUANTIZED != self.flags:
+            raise ValueError("Snapshot was packed with a different codec")
+
+        game.state = state
+        game.score = score
+        game.high_score = high_score
+        game.level = level
+
+        # Timestamps are absolute. A simulated clock is rewound to the
+        # snapshot; on the real clock they are shifted to the current time
+        timer = game.timer
+        if hasattr(timer, "ticks"):
+            timer.ticks = ticks
+            shift = 0
+        else:
+            shift = timer.get_ticks() - int(ticks)
+        game.asteroid_spawn_timer = spawn_timer + shift
+        offset = HEADER.size
+
+        # RNG streams
+        for rng in (game.spawn_rng, game.asteroid_rng):
+            rng_version, has_gauss, gauss_next = RNG_HEADER.unpack_from(data, offset)
+            words = RNG_WORDS.unpack_from(data, offset + RNG_HEADER.size)
+            rng.setstate((rng_version, words, gauss_next if has_gauss else None))
+            offset += RNG_SIZE
+
+        quantize = self.quantize
+        unit = 1 / FIXED_POINT_SCALE
+
+        # Player
+        player = game.player
+        (x, y, angle, dx, dy, player.thruster_active, player.can_shoot, last_shot_time,
+         player.lives, player.invulnerable, invulnerable_time,
+         player.visible) = self.player_record.unpack_from(data, offset)
+        if quantize:
+            x, y, angle, dx, dy = x * unit, y * unit, angle * unit, dx * unit, dy * unit
+        player.x, player.y, player.angle, player.dx, player.dy = x, y, angle, dx, dy
+        player.last_shot_time = last_shot_time + shift
+        player.invulnerable_time = invulnerable_time + shift
+        player.image, player.rect = rotation_cache.rotate(player.original_image, angle, (x, y))
+        offset += self.player_record.size
+
+        # Match the entity counts, recycling through the pools
+        asteroids = game.asteroids
+        while len(asteroids) > asteroid_count:
+            asteroid = asteroids.pop()
+            game.forget_asteroid_image(asteroid)
+            game.asteroid_pool.release(asteroid)
+        while len(asteroids) < asteroid_count:
+            asteroids.append(game.asteroid_pool.acquire(0, 0, 1, self.scratch_rng))
+
+        bullets = game.bullets
+        while len(bullets) > bullet_count:
+            game.bullet_pool.release(bullets.pop())
+        while len(bullets) < bullet_count:
+            bullets.append(game.bullet_pool.acquire(0, 0, 0, timer=timer))
+
+        # Asteroids
+        view = memoryview(data)
+        end = offset + asteroid_count * self.asteroid_record.size
+        records = self.asteroid_record.iter_unpack(view[offset:end])
+        for asteroid, record in zip(asteroids, records):
+            x, y, dx, dy, speed, rotation, rotation_speed, size, radius, variant_id = record
+            if quantize:
+                x, y, dx, dy = x * unit, y * unit, dx * unit, dy * unit
+                speed, rotation, rotation_speed = speed * unit, rotation * unit, rotation_speed * unit
+
+            bank = asteroid.variant_bank
+            if variant_id >= 0 and bank is not None and variant_id < len(bank):
+                if asteroid.variant_id is None:
+                    game.forget_asteroid_image(asteroid)
+                asteroid.original_image = bank.get(variant_id).image
+                asteroid.variant_id = variant_id
+            elif asteroid.variant_id is not None or asteroid.radius != radius:
+                # Shapes outside this game's bank are cosmetic; draw a fresh one
+                game.forget_asteroid_image(asteroid)
+                asteroid.variant_id = None
+                asteroid.radius = radius
+                asteroid.rng = self.scratch_rng
+                asteroid.original_image = asteroid.create_asteroid_image()
+
+            asteroid.rng = game.asteroid_rng
+            asteroid.x, asteroid.y, asteroid.dx, asteroid.dy = x, y, dx, dy
+            asteroid.speed, asteroid.rotation, asteroid.rotation_speed = speed, rotation, rotation_speed
+            asteroid.size, asteroid.radius = size, radius
+            asteroid.image, asteroid.rect = rotation_cache.rotate(asteroid.original_image, rotation, (x, y))
+        offset = end
+
+        # Bullets
+        end = offset + bullet_count * self.bullet_record.size
+        records = self.bullet_record.iter_unpack(view[offset:end])
+        for bullet, (x, y, angle, speed, dx, dy, creation_time) in zip(bullets, records):
+            if quantize:
+                x, y, angle = x * unit, y * unit, angle * unit
+                speed, dx, dy = speed * unit, dx * unit, dy * unit
+            bullet.x, bullet.y, bullet.angle, bullet.speed, bullet.dx, bullet.dy = x, y, angle, speed, dx, dy
+            bullet.creation_time = creation_time + shift
+            bullet.timer = timer
+            bullet.rect.center = (x, y)
+
+        # Redraw everything on the next frame
+        game.hud_key = None
+        game.full_redraw = True
+
+
+# Shared codecs
+quantized_codec = SnapshotCodec(quantize=True)
+exact_codec = SnapshotCodec(quantize=False)
+
+
+def take_snapshot(game, quantize=True):
+    """Return the game's state as bytes."""
+    codec = quantized_codec if quantize else exact_codec
+    return codec.pack(game)
+
+
+def restore_snapshot(game, data):
+    """Load a snapshot into game, whichever codec packed it."""
+    codec = quantized_codec if data[5] & FLAG_QUANTIZED else exact_codec
+    codec.restore(game, data)
@@ -0,0 +1,165 @@
+"""Soak test: let an autopilot play for hours and watch for drift.
+
+The game plays itself on a fixed-step simulated clock, windowed or
+headless, and restarts after every game over. Every --interval seconds
+a row is appended to the report with frame-time percentiles, entity
+counts, cache sizes and the process RSS, so leaks and slowdowns show up
+as trends:
+
+    python soak.py --pilot dodge --minutes 120 --output soak.csv
+    python soak.py --pilot random --minutes 10 --windowed
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from autopilot import PILOTS, make_pilot
+from rotation_cache import rotation_cache
+from stats import percentile
+
+REPORT_FIELDS = (
+    "wall_s", "game_s", "games", "frames", "fps",
+    "frame_p50_ms", "frame_p95_ms", "frame_p99_ms", "frame_max_ms",
+    "asteroids", "bullets", "pool_asteroids_high_water", "pool_bullets_high_water",
+    "rotation_cache_entries", "text_cache_entries", "rss_mib",
+)
+
+
+def rss_bytes():
+    """Return the resident set size of this process, or its peak if unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class SoakMonitor:
+    # Collects frame times and writes one report row per interval
+    def __init__(self, game, interval=60.0, output=None):
+        self.game = game
+        self.interval = interval
+        self.frame_times = []
+        self.frames = 0
+        self.games = 0
+        self.start = time.perf_counter()
+        self.last_report = self.start
+
+        self.file = open(output, "w", newline="") if output else None
+        self.writer = csv.DictWriter(self.file, REPORT_FIELDS) if self.file else None
+        if self.writer:
+            self.writer.writeheader()
+
+    def frame(self, elapsed):
+        self.frame_times.append(elapsed)
+        self.frames += 1
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval:
+            self.report(now)
+
+    def report(self, now=None):
+        now = now or time.perf_counter()
+        times = sorted(self.frame_times) or [0.0]
+        game = self.game
+        pools = game.pool_stats()
+        row = {
+            "wall_s": round(now - self.start, 1),
+            "game_s": round(game.timer.ticks / 1000, 1),
+            "games": self.games,
+            "frames": self.frames,
+            "fps": round(len(self.frame_times) / max(now - self.last_report, 1e-9), 1),
+            "frame_p50_ms": round(percentile(times, 0.5) * 1000, 3),
+            "frame_p95_ms": round(percentile(times, 0.95) * 1000, 3),
+            "frame_p99_ms": round(percentile(times, 0.99) * 1000, 3),
+            "frame_max_ms": round(times[-1] * 1000, 3),
+            "asteroids": len(game.asteroids),
+            "bullets": len(game.bullets),
+            "pool_asteroids_high_water": pools["asteroids"]["high_water"],
+            "pool_bullets_high_water": pools["bullets"]["high_water"],
+            "rotation_cache_entries": len(rotation_cache.entries),
+            "text_cache_entries": len(game.text_cache),
+            "rss_mib": round(rss_bytes() / (1024 * 1024), 1),
+        }
+        print(" ".join(f"{name}={value}" for name, value in row.items()))
+        if self.writer:
+            self.writer.writerow(row)
+            self.file.flush()
+
+        self.frame_times = []
+        self.last_report = now
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+def soak(game, monitor, duration, render=True, windowed=False, capped=True):
+    """Play until duration seconds of wall time have passed or the window closes."""
+    # Imported here so the module can be loaded before SDL is configured
+    from space_shooter import FPS, PLAYING
+
+    end = time.perf_counter() + duration
+    while game.running and time.perf_counter() < end:
+        if windowed:
+            game.handle_events()
+        if game.state != PLAYING:
+            game.start_new_game()
+            monitor.games += 1
+
+        start = time.perf_counter()
+        game.step(game.read_keys(), render=render)
+        monitor.frame(time.perf_counter() - start)
+
+        if windowed and capped:
+            game.clock.tick(FPS)
+    monitor.report()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Let an autopilot play and record long-run metrics.")
+    parser.add_argument("--pilot", choices=sorted(PILOTS), default="dodge", help="Autopilot strategy")
+    parser.add_argument("--minutes", type=float, default=60, help="Wall-clock duration")
+    parser.add_argument("--interval", type=float, default=60, help="Seconds between report rows")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the game and the pilot")
+    parser.add_argument("--windowed", action="store_true", help="Open a window instead of running headless")
+    parser.add_argument("--uncapped", dest="capped", action="store_false",
+                        help="Do not limit a windowed run to the game's FPS")
+    parser.add_argument("--no-render", dest="render", action="store_false",
+                        help="Skip drawing in headless runs (simulation only)")
+    parser.add_argument("--output", help="Write report rows to this CSV file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.windowed:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from space_shooter import Game, SimClock
+
+    game = Game(headless=not args.windowed, timer=SimClock(), seed=args.seed,
+                autopilot=make_pilot(args.pilot, args.seed), idle_wait=False)
+    monitor = SoakMonitor(game, args.interval, args.output)
+    try:
+        soak(game, monitor, args.minutes * 60, render=args.render or args.windowed,
+             windowed=args.windowed, capped=args.capped)
+    except KeyboardInterrupt:
+        monitor.report()
+    finally:
+        monitor.close()
+
+
+if __name__ == "__main__":
+    main()
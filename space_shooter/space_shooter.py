@@ -2,7 +2,25 @@ import pygame
 import sys
 import math
 import random
+import argparse
+import atexit
+import os
+import time
 
+from rotation_cache import rotation_cache
+from spatial_hash import SpatialHash
+from entity_store import EntityStore
+from pools import ObjectPool
+from text_cache import TextCache
+from replay import ReplayReader, ReplayWriter, encode_inputs
+from snapshot import restore_snapshot, take_snapshot
+from autopilot import PILOTS, make_pilot
+from stress import FRAME_BUDGET_MS, run_stress
+from frame_profiler import FrameProfiler
+from sampling_profiler import SamplingProfiler
+from tracing import trace_to, traced
+from atlas import TextureAtlas
+from asteroid_bank import AsteroidBank, RADIUS_RANGES, draw_asteroid_shape, random_asteroid_shape
 
 
 # Initialize Pygame
@@ -27,29 +45,103 @@ MENU = 0
 PLAYING = 1
 GAME_OVER = 2
 
+# Render modes
+RENDER_FULL = "full"    # Redraw and flip the whole window every frame
+RENDER_DIRTY = "dirty"  # Repaint and push only the areas that changed
+
+# Longest time (ms) an idle screen blocks waiting for input
+IDLE_WAIT_TIMEOUT = 500
+
+# Dirty rendering falls back to a full flip above this share of the screen
+DIRTY_FLIP_THRESHOLD = 0.5
+
+# Frames between refreshes of the profiler overlay
+PROFILER_REFRESH_FRAMES = 15
+
+class SimClock:
+    # Manually advanced stand-in for pygame.time, used by headless runs
+    def __init__(self, start=0):
+        self.ticks = start
+    
+    def get_ticks(self):
+        return int(self.ticks)
+    
+    def advance(self, dt):
+        self.ticks += dt
+
+
+class KeyState:
+    # Stand-in for pygame.key.get_pressed() built from a set of key codes
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+    
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+class Difficulty:
+    # Balance knobs; the defaults are the original tuning
+    def __init__(self, spawn_delay=3000, initial_asteroids=5, base_max_asteroids=5,
+                 asteroids_per_level=2, asteroid_speed_scale=1.0, shoot_cooldown=250,
+                 invulnerable_duration=3000):
+        self.spawn_delay = spawn_delay  # Milliseconds between asteroid spawns
+        self.initial_asteroids = initial_asteroids
+        self.base_max_asteroids = base_max_asteroids
+        self.asteroids_per_level = asteroids_per_level
+        self.asteroid_speed_scale = asteroid_speed_scale
+        self.shoot_cooldown = shoot_cooldown  # Milliseconds between shots
+        self.invulnerable_duration = invulnerable_duration
+    
+    def max_asteroids(self, level):
+        # Cap on timed spawns, rising with the level
+        return self.base_max_asteroids + level * self.asteroids_per_level
+    
+    def as_dict(self):
+        return dict(vars(self))
+
+
 class Bullet:
-    def __init__(self, x, y, angle, speed=10):
+    # Sprite shared by every bullet, built on first use
+    shared_image = None
+    
+    def __init__(self, x, y, angle, speed=10, timer=None):
+        # Shared sprite and rect, reused when the bullet is recycled
+        self.radius = 3
+        self.image = self.get_shared_image()
+        self.rect = self.image.get_rect()
+        
+        self.reset(x, y, angle, speed, timer)
+    
+    def reset(self, x, y, angle, speed=10, timer=None):
+        # Time source (pygame.time unless a simulated clock is injected)
+        self.timer = timer or pygame.time
+        
         # Position
         self.x = x
         self.y = y
         
-        # Size
-        self.radius = 3
-        
         # Movement
         self.angle = math.radians(angle)
         self.speed = speed
         self.dx = math.sin(self.angle) * self.speed
         self.dy = -math.cos(self.angle) * self.speed
         
-        # Create bullet image
-        self.image = self.create_bullet_image()
-        self.rect = self.image.get_rect(center=(self.x, self.y))
+        # Place the shared bullet image
+        self.rect.center = (self.x, self.y)
         
         # Lifespan in milliseconds (3 seconds)
-        self.creation_time = pygame.time.get_ticks()
+        self.creation_time = self.timer.get_ticks()
         self.lifespan = 3000
     
+    def get_shared_image(self):
+        if Bullet.shared_image is None:
+            image = self.create_bullet_image()
+            # Convert once to the display format when a window exists
+            if pygame.display.get_surface() is not None:
+                image = image.convert_alpha()
+            Bullet.shared_image = image
+        return Bullet.shared_image
+    
     def create_bullet_image(self):
         # Create a simple circular bullet
         surface = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
@@ -57,6 +149,7 @@ class Bullet:
         pygame.draw.circle(surface, WHITE, (self.radius, self.radius), self.radius // 2)
         return surface
     
+    @traced()
     def update(self, screen_width, screen_height):
         # Move the bullet
         self.x += self.dx
@@ -66,7 +159,7 @@ class Bullet:
         self.rect.center = (self.x, self.y)
         
         # Check if bullet is out of screen or expired
-        current_time = pygame.time.get_ticks()
+        current_time = self.timer.get_ticks()
         if (self.x < -10 or self.x > screen_width + 10 or 
             self.y < -10 or self.y > screen_height + 10 or
             current_time - self.creation_time > self.lifespan):
@@ -75,15 +168,22 @@ class Bullet:
         # Bullet is still active
         return True
     
+    @traced()
     def draw(self, screen):
-        screen.blit(self.image, self.rect.topleft)
+        return screen.blit(self.image, self.rect.topleft)
     
     def get_collision_radius(self):
         return self.radius
 
 
 class Player:
-    def __init__(self, x, y):
+    # Ship frame from the texture atlas; None draws the ship in code
+    atlas_image = None
+    
+    def __init__(self, x, y, timer=None):
+        # Time source (pygame.time unless a simulated clock is injected)
+        self.timer = timer or pygame.time
+        
         # Position and size
         self.x = x
         self.y = y
@@ -121,6 +221,9 @@ class Player:
         self.visible = True
     
     def create_ship_image(self):
+        if Player.atlas_image is not None:
+            return Player.atlas_image
+        
         # Create a triangle ship surface
         ship_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
         points = [(self.width//2, 0), (0, self.height), (self.width, self.height)]
@@ -128,14 +231,16 @@ class Player:
         pygame.draw.rect(ship_surface, ORANGE, (self.width//4, self.height-10, self.width//3, 5))
         return ship_surface
     
-    def handle_input(self):
+    @traced()
+    def handle_input(self, keys=None):
         # Reset movement
         self.dx = 0
         self.dy = 0
         self.thruster_active = False
         
-        # Get keyboard state
-        keys = pygame.key.get_pressed()
+        # Get keyboard state unless synthetic input was passed in
+        if keys is None:
+            keys = pygame.key.get_pressed()
         
         # Move based on arrow keys
         if keys[pygame.K_LEFT]:
@@ -154,6 +259,7 @@ class Player:
         if keys[pygame.K_d]:  # Rotate clockwise
             self.angle -= self.rotation_speed
     
+    @traced()
     def update(self, screen_width, screen_height):
         # Apply movement
         self.x += self.dx
@@ -166,12 +272,11 @@ class Player:
         # Update rect position
         self.rect.center = (self.x, self.y)
         
-        # Rotate the image
-        self.image = pygame.transform.rotate(self.original_image, self.angle)
-        self.rect = self.image.get_rect(center=self.rect.center)
+        # Rotate the image (cached per quantized angle)
+        self.image, self.rect = rotation_cache.rotate(self.original_image, self.angle, self.rect.center)
         
         # Update shooting cooldown
-        current_time = pygame.time.get_ticks()
+        current_time = self.timer.get_ticks()
         if current_time - self.last_shot_time >= self.shoot_cooldown:
             self.can_shoot = True
         
@@ -184,7 +289,8 @@ class Player:
                 # Flash the ship
                 self.visible = ((current_time // 150) % 2 == 0)
     
-    def shoot(self):
+    @traced()
+    def shoot(self, bullet_pool=None):
         if not self.can_shoot:
             return None
         
@@ -194,11 +300,14 @@ class Player:
         bullet_y = self.y - math.cos(angle_rad) * self.height//2
         
         # Create a new bullet
-        bullet = Bullet(bullet_x, bullet_y, -self.angle)
+        if bullet_pool is not None:
+            bullet = bullet_pool.acquire(bullet_x, bullet_y, -self.angle, timer=self.timer)
+        else:
+            bullet = Bullet(bullet_x, bullet_y, -self.angle, timer=self.timer)
         
         # Reset the cooldown
         self.can_shoot = False
-        self.last_shot_time = pygame.time.get_ticks()
+        self.last_shot_time = self.timer.get_ticks()
         
         return bullet
     
@@ -212,12 +321,16 @@ class Player:
         
         # Make player invulnerable temporarily
         self.invulnerable = True
-        self.invulnerable_time = pygame.time.get_ticks()
+        self.invulnerable_time = self.timer.get_ticks()
         
         # Return True if the player is still alive, False otherwise
         return self.lives > 0
     
+    @traced()
     def draw(self, screen):
+        # Return the screen areas touched, for dirty-rect rendering
+        rects = []
+        
         # Only draw the ship if it's visible
         if self.visible:
             # Draw thruster if active
@@ -231,17 +344,21 @@ class Player:
                     (thruster_x - thruster_size, thruster_y + thruster_size),
                     (thruster_x + thruster_size, thruster_y + thruster_size)
                 ]
-                pygame.draw.polygon(screen, ORANGE, points)
+                rects.append(pygame.draw.polygon(screen, ORANGE, points))
             
             # Draw the spaceship
-            screen.blit(self.image, self.rect.topleft)
+            rects.append(screen.blit(self.image, self.rect.topleft))
+        
+        return rects
     
     def draw_lives(self, screen, x, y, spacing=30):
         # Draw the player's lives as small ships
+        rects = []
         for i in range(self.lives):
             # Create a small version of the ship
             mini_ship = pygame.transform.scale(self.original_image, (20, 20))
-            screen.blit(mini_ship, (x + i * spacing, y))
+            rects.append(screen.blit(mini_ship, (x + i * spacing, y)))
+        return rects
     
     def get_collision_radius(self):
         return min(self.width, self.height) // 3
@@ -258,7 +375,20 @@ class Player:
 
 
 class Asteroid:
-    def __init__(self, x, y, size):
+    # Shared bank of pre-drawn shapes; None draws a new shape per asteroid
+    variant_bank = None
+    
+    # Multiplier on every asteroid's speed, set from the game's difficulty
+    speed_scale = 1.0
+    
+    def __init__(self, x, y, size, rng=None):
+        self.reset(x, y, size, rng)
+    
+    def reset(self, x, y, size, rng=None):
+        # Random stream for shape, motion and split offsets
+        self.rng = rng or random
+        rng = self.rng
+        
         # Position
         self.x = x
         self.y = y
@@ -266,63 +396,42 @@ class Asteroid:
         # Size categories: 3 = large, 2 = medium, 1 = small
         self.size = size
         
-        # Set physical size based on size category
-        if self.size == 3:
-            self.radius = random.randint(35, 45)
-        elif self.size == 2:
-            self.radius = random.randint(20, 30)
+        # Pick a pre-drawn shape, which also fixes the physical size
+        variant = None
+        if Asteroid.variant_bank is not None:
+            variant = Asteroid.variant_bank.pick(self.size, rng)
+            self.variant_id = variant.variant_id
+            self.radius = variant.radius
         else:
-            self.radius = random.randint(10, 15)
+            # Set physical size based on size category
+            self.variant_id = None
+            self.radius = rng.randint(*RADIUS_RANGES[self.size])
         
         # Movement
         speed_factor = 4 - self.size  # Smaller asteroids move faster
-        self.speed = random.uniform(0.5, 1.5) * speed_factor
-        angle = random.uniform(0, math.pi * 2)
+        self.speed = rng.uniform(0.5, 1.5) * speed_factor * Asteroid.speed_scale
+        angle = rng.uniform(0, math.pi * 2)
         self.dx = math.cos(angle) * self.speed
         self.dy = math.sin(angle) * self.speed
         
         # Rotation
         self.rotation = 0
-        self.rotation_speed = random.uniform(-1, 1)
+        self.rotation_speed = rng.uniform(-1, 1)
         
-        # Create the asteroid image
-        self.original_image = self.create_asteroid_image()
+        # Use the variant's image or create a new one
+        if variant is not None:
+            self.original_image = variant.image
+        else:
+            self.original_image = self.create_asteroid_image()
         self.image = self.original_image
         self.rect = self.image.get_rect(center=(self.x, self.y))
     
     def create_asteroid_image(self):
-        # Create a surface for the asteroid
-        size = self.radius * 2
-        surface = pygame.Surface((size, size), pygame.SRCALPHA)
-        
-        # Choose a color
-        color = (150, 150, 150)  # Grey
-        
-        # Create an irregular shape
-        num_points = random.randint(8, 12)
-        points = []
-        
-        for i in range(num_points):
-            angle = 2 * math.pi * i / num_points
-            distance = self.radius * random.uniform(0.8, 1.2)
-            point_x = self.radius + math.cos(angle) * distance
-            point_y = self.radius + math.sin(angle) * distance
-            points.append((point_x, point_y))
-        
-        # Draw the asteroid shape
-        pygame.draw.polygon(surface, color, points)
-        
-        # Add some craters for visual interest
-        num_craters = random.randint(2, 5)
-        for _ in range(num_craters):
-            crater_x = random.randint(int(size * 0.2), int(size * 0.8))
-            crater_y = random.randint(int(size * 0.2), int(size * 0.8))
-            crater_radius = random.randint(int(size * 0.05), int(size * 0.15))
-            crater_color = (100, 100, 100)  # Darker grey
-            pygame.draw.circle(surface, crater_color, (crater_x, crater_y), crater_radius)
-        
-        return surface
+        # Draw an irregular shape with some craters for visual interest
+        points, craters = random_asteroid_shape(self.radius, self.rng)
+        return draw_asteroid_shape(self.radius, points, craters)
     
+    @traced()
     def update(self, screen_width, screen_height):
         # Update position
         self.x += self.dx
@@ -342,17 +451,18 @@ class Asteroid:
         elif self.y > screen_height + self.radius:
             self.y = -self.radius
         
-        # Update rect and rotated image
-        self.image = pygame.transform.rotate(self.original_image, self.rotation)
-        self.rect = self.image.get_rect(center=(self.x, self.y))
+        # Update rect and rotated image (cached per quantized angle)
+        self.image, self.rect = rotation_cache.rotate(self.original_image, self.rotation, (self.x, self.y))
     
+    @traced()
     def draw(self, screen):
-        screen.blit(self.image, self.rect.topleft)
+        return screen.blit(self.image, self.rect.topleft)
     
     def get_collision_radius(self):
         return self.radius * 0.8
     
-    def split(self):
+    @traced()
+    def split(self, asteroid_pool=None):
         # When an asteroid is hit, it splits into smaller asteroids
         if self.size > 1:
             new_size = self.size - 1
@@ -360,9 +470,12 @@ class Asteroid:
             
             # Create 2 smaller asteroids
             for _ in range(2):
-                offset_x = random.uniform(-10, 10)
-                offset_y = random.uniform(-10, 10)
-                new_asteroid = Asteroid(self.x + offset_x, self.y + offset_y, new_size)
+                offset_x = self.rng.uniform(-10, 10)
+                offset_y = self.rng.uniform(-10, 10)
+                if asteroid_pool is not None:
+                    new_asteroid = asteroid_pool.acquire(self.x + offset_x, self.y + offset_y, new_size, self.rng)
+                else:
+                    new_asteroid = Asteroid(self.x + offset_x, self.y + offset_y, new_size, self.rng)
                 new_asteroids.append(new_asteroid)
             
             return new_asteroids
@@ -372,31 +485,106 @@ class Asteroid:
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, entity_store=False, headless=False, timer=None,
+                 asteroid_variants=8, asteroid_bank_path=None, asteroid_bank_seed=0,
+                 render_mode=RENDER_FULL, idle_wait=True, seed=None, replay_dir=None,
+                 difficulty=None, autopilot=None, profiler=None, atlas_path=None):
+        # Headless games render into an offscreen surface and never open a window
+        self.headless = headless
+        
+        # Time source for cooldowns, lifespans and spawning. Recorded games
+        # also run on simulated time so playback sees the same timings
+        if timer is None:
+            timer = SimClock() if headless or replay_dir else pygame.time
+        self.timer = timer
+        self.tick_ms = 1000 / FPS
+        
+        # Optional scripted pilot that replaces the keyboard
+        self.autopilot = autopilot
+        
+        # Optional per-phase frame timing; F3 toggles its on-screen overlay
+        self.profiler = profiler
+        self.show_profiler = False
+        self.profiler_font = None
+        self.profiler_panel = None
+        
+        # Replays are written to replay_dir, one file per game played
+        self.replay_dir = replay_dir
+        self.recorder = None
+        self.shoot_pressed = False
+        
         # Set up the display
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("Space Shooter")
+        if headless:
+            self.screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        else:
+            self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+            pygame.display.set_caption("Space Shooter")
         self.clock = pygame.time.Clock()
         self.running = True
         
+        # Seeded random streams so a session can be reproduced
+        self.seed_rng(seed)
+        
+        # Sprites sliced from one shared atlas sheet (see setup_assets.py)
+        self.atlas = TextureAtlas.load(atlas_path) if atlas_path else None
+        self.use_atlas(self.atlas)
+        
+        # Pre-draw asteroid shapes once (or load them from disk)
+        self.asteroid_variants = asteroid_variants
+        self.asteroid_bank_seed = asteroid_bank_seed
+        if self.atlas is not None:
+            Asteroid.variant_bank = self.atlas.asteroid_bank()
+            self.asteroid_variants = Asteroid.variant_bank.variants_per_size
+            self.asteroid_bank_seed = Asteroid.variant_bank.seed
+        elif asteroid_variants:
+            if asteroid_bank_path:
+                Asteroid.variant_bank = AsteroidBank.load_or_generate(
+                    asteroid_bank_path, asteroid_variants, asteroid_bank_seed)
+            else:
+                Asteroid.variant_bank = AsteroidBank.generate(asteroid_variants, asteroid_bank_seed)
+        else:
+            Asteroid.variant_bank = None
+        
         # Set up fonts
         self.font_small = pygame.font.SysFont("Arial", 24)
         self.font_medium = pygame.font.SysFont("Arial", 32)
         self.font_large = pygame.font.SysFont("Arial", 64)
         
+        # Rendered text is cached; the HUD panel is rebuilt only when its values change
+        self.text_cache = TextCache()
+        self.hud_panel = None
+        self.hud_key = None
+        self.hud_rects = []
+        
+        # Semi-transparent game over overlay, allocated once
+        self.overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
+        self.overlay.fill((0, 0, 0, 180))  # Black with opacity
+        
         # Game state
         self.state = MENU
         
         # Create player spaceship
-        self.player = Player(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
+        self.player = Player(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2, timer=self.timer)
         
         # Create lists for game objects
         self.asteroids = []
         self.bullets = []
         
+        # Free lists that recycle bullets and asteroids
+        self.bullet_pool = ObjectPool(Bullet)
+        self.asteroid_pool = ObjectPool(Asteroid)
+        
+        # Optional array-backed storage; the lists above then hold its views
+        self.store = EntityStore() if entity_store else None
+        
         # Asteroid spawning system
         self.asteroid_spawn_timer = 0
-        self.asteroid_spawn_delay = 3000  # milliseconds between asteroid spawns
+        
+        # Balance knobs for spawning, asteroid speed, shooting and invulnerability
+        self.set_difficulty(difficulty or Difficulty())
+        
+        # Broad phase grid for collision checks
+        self.collision_grid = SpatialHash(WINDOW_WIDTH, WINDOW_HEIGHT, cell_size=64)
         
         # Score and level
         self.score = 0
@@ -405,9 +593,66 @@ class Game:
         
         # Grid setting
         self.draw_grid = True
+        
+        # Background and grid are drawn once into a cached surface
+        self.background = None
+        self.build_background()
+        
+        # Dirty-rect rendering: areas drawn last frame and whether the next
+        # frame has to repaint the whole screen
+        self.render_mode = render_mode
+        self.dirty_rects = []
+        self.full_redraw = True
+        self.last_drawn_state = None
+        
+        # Menu and game over screens block on input instead of ticking at FPS
+        self.idle_wait = idle_wait
+        self.needs_redraw = True
+    
+    def use_atlas(self, atlas):
+        # Point the shared sprites at atlas frames, or back to drawing them
+        if atlas is None:
+            if Player.atlas_image is not None:
+                Bullet.shared_image = None
+            Player.atlas_image = None
+            return
+        Player.atlas_image = atlas["player_ship"]
+        Bullet.shared_image = atlas["bullet"]
+        
+        # Pre-rotated ship frames save the rotation cache from rotating them
+        rotations = atlas.rotations("player_ship")
+        if rotations:
+            rotations[0] = Player.atlas_image
+        for angle, rotated in rotations.items():
+            rotation_cache.put(Player.atlas_image, angle, rotated)
+    
+    def seed_rng(self, seed=None):
+        # Independent streams keep spawn positions stable when asteroid
+        # shapes or splits consume a different amount of randomness
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.spawn_rng = random.Random(f"{seed}:spawn")
+        self.asteroid_rng = random.Random(f"{seed}:asteroid")
+    
+    def set_difficulty(self, difficulty):
+        self.difficulty = difficulty
+        self.asteroid_spawn_delay = difficulty.spawn_delay
+        self.player.shoot_cooldown = difficulty.shoot_cooldown
+        self.player.invulnerable_duration = difficulty.invulnerable_duration
+        Asteroid.speed_scale = difficulty.asteroid_speed_scale
     
     def start_new_game(self):
+        # Release cached rotations of the previous game's asteroids
+        for asteroid in self.asteroids:
+            self.forget_asteroid_image(asteroid)
+        
         # Reset game objects and values
+        if self.store is not None:
+            self.store.clear()
+        else:
+            self.bullet_pool.release_all(self.bullets)
+            self.asteroid_pool.release_all(self.asteroids)
         self.asteroids = []
         self.bullets = []
         self.score = 0
@@ -417,98 +662,199 @@ class Game:
         self.player.reset(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
         
         # Spawn initial asteroids
-        self.spawn_initial_asteroids(5)
+        self.spawn_initial_asteroids(self.difficulty.initial_asteroids)
         
         # Set game state to playing
         self.state = PLAYING
-    
+        
+    def reset(self, seed=None):
+        # Start a game as if this Game had just been built: simulated clock,
+        # spawn timer, player timers and high score all go back to zero
+        if hasattr(self.timer, "ticks"):
+            self.timer.ticks = 0
+        if seed is not None:
+            self.seed_rng(seed)
+        self.asteroid_spawn_timer = 0
+        self.high_score = 0
+        
+        player = self.player
+        player.dx = 0
+        player.dy = 0
+        player.thruster_active = False
+        player.can_shoot = True
+        player.last_shot_time = 0
+        player.invulnerable_time = 0
+        player.image = player.original_image
+        
+        # Nothing on screen belongs to the new game yet
+        self.dirty_rects = []
+        self.full_redraw = True
+        self.last_drawn_state = None
+        
+        self.start_new_game()
+        
     def spawn_initial_asteroids(self, count):
         for _ in range(count):
             self.spawn_asteroid_away_from_player()
     
     def spawn_asteroid_away_from_player(self):
         # Choose a random spawn position at the edge of the screen
-        side = random.randint(0, 3)  # 0: top, 1: right, 2: bottom, 3: left
+        rng = self.spawn_rng
+        side = rng.randint(0, 3)  # 0: top, 1: right, 2: bottom, 3: left
         
         if side == 0:  # Top
-            x = random.randint(0, WINDOW_WIDTH)
+            x = rng.randint(0, WINDOW_WIDTH)
             y = -50
         elif side == 1:  # Right
             x = WINDOW_WIDTH + 50
-            y = random.randint(0, WINDOW_HEIGHT)
+            y = rng.randint(0, WINDOW_HEIGHT)
         elif side == 2:  # Bottom
-            x = random.randint(0, WINDOW_WIDTH)
+            x = rng.randint(0, WINDOW_WIDTH)
             y = WINDOW_HEIGHT + 50
         else:  # Left
             x = -50
-            y = random.randint(0, WINDOW_HEIGHT)
+            y = rng.randint(0, WINDOW_HEIGHT)
         
         # Create a new large asteroid
-        asteroid = Asteroid(x, y, 3)  # Size 3 = large
+        asteroid = self.asteroid_pool.acquire(x, y, 3, self.asteroid_rng)  # Size 3 = large
         
         # Add to asteroid list
-        self.asteroids.append(asteroid)
+        self.add_asteroid(asteroid)
+    
+    def add_asteroid(self, asteroid):
+        if self.store is not None:
+            # The store copies the asteroid, so the instance can be recycled
+            self.store.add_asteroid(asteroid)
+            self.asteroid_pool.release(asteroid)
+            self.asteroids = self.store.asteroid_views
+        else:
+            self.asteroids.append(asteroid)
     
+    def add_bullet(self, bullet):
+        if self.store is not None:
+            # The store copies the bullet, so the instance can be recycled
+            self.store.add_bullet(bullet)
+            self.bullet_pool.release(bullet)
+            self.bullets = self.store.bullet_views
+        else:
+            self.bullets.append(bullet)
+    
+    @traced()
     def handle_events(self):
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
+            self.handle_event(event)
+    
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.running = False
+        
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                # In menu, exit. In game or game over, return to menu
+                if self.state == MENU:
+                    self.running = False
+                else:  # PLAYING or GAME_OVER
+                    self.state = MENU
             
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    # In menu, exit. In game or game over, return to menu
-                    if self.state == MENU:
-                        self.running = False
-                    else:  # PLAYING or GAME_OVER
-                        self.state = MENU
-                
-                elif event.key == pygame.K_g:  # Toggle grid with G key
-                    self.draw_grid = not self.draw_grid
-                
-                elif event.key == pygame.K_SPACE:
-                    # In menu or game over, start new game. In game, shoot
-                    if self.state == MENU or self.state == GAME_OVER:
-                        self.start_new_game()
-                    elif self.state == PLAYING:
-                        self.handle_shooting()
-        
+            elif event.key == pygame.K_g:  # Toggle grid with G key
+                self.draw_grid = not self.draw_grid
+                self.build_background()
+            
+            elif event.key == pygame.K_F3:  # Toggle the frame profiler overlay
+                self.toggle_profiler_overlay()
+            
+            elif event.key == pygame.K_SPACE:
+                # In menu or game over, start new game. In game, shoot
+                if self.state == MENU or self.state == GAME_OVER:
+                    self.start_new_game()
+                elif self.state == PLAYING:
+                    self.handle_shooting()
+                    self.shoot_pressed = True
+    
+    def read_keys(self):
+        # Keys held this tick: the autopilot's choice, otherwise the keyboard
+        if self.autopilot is not None:
+            return KeyState(self.autopilot(self))
+        return pygame.key.get_pressed()
+    
     def handle_shooting(self):
         # Handle player shooting
-        bullet = self.player.shoot()
+        bullet = self.player.shoot(self.bullet_pool)
         if bullet:
-            self.bullets.append(bullet)
+            self.add_bullet(bullet)
     
-    def update(self):
+    @traced()
+    def step(self, inputs=(), render=False, shoot_pressed=False):
+        # Advance the simulation by one fixed tick of tick_ms milliseconds
+        if not isinstance(inputs, KeyState):
+            inputs = KeyState(inputs)
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin_frame()
+        # pygame.time runs on its own; only simulated clocks are advanced
+        if hasattr(self.timer, "advance"):
+            self.timer.advance(self.tick_ms)
+        
+        # A SPACE key press fires before the held-key update, as in handle_events
+        if shoot_pressed and self.state == PLAYING:
+            self.handle_shooting()
+        self.update(inputs)
+        if render:
+            self.draw()
+        if profiler is not None:
+            profiler.end_frame()
+    
+    @traced()
+    def update(self, keys=None):
+        profiler = self.profiler
         if self.state == PLAYING:
+            # Read input unless synthetic input was passed in
+            if keys is None:
+                keys = self.read_keys()
+            
             # Handle player input
-            self.player.handle_input()
+            self.player.handle_input(keys)
             
             # Handle continuous shooting with spacebar held down
-            keys = pygame.key.get_pressed()
             if keys[pygame.K_SPACE]:
                 self.handle_shooting()
             
             # Update player
             self.player.update(WINDOW_WIDTH, WINDOW_HEIGHT)
+            if profiler is not None:
+                profiler.mark("player")
             
-            # Update bullets
-            for bullet in self.bullets[:]:
-                if not bullet.update(WINDOW_WIDTH, WINDOW_HEIGHT):
-                    if bullet in self.bullets:
-                        self.bullets.remove(bullet)
-            
-            # Update asteroids
-            for asteroid in self.asteroids[:]:
-                asteroid.update(WINDOW_WIDTH, WINDOW_HEIGHT)
-            
-            # Check for collisions
-            self.check_collisions()
+            if self.store is not None:
+                # Move everything with the vectorized kernels
+                self.update_store()
+            else:
+                # Update bullets, recycling expired ones in a single pass
+                active_bullets = []
+                for bullet in self.bullets:
+                    if bullet.update(WINDOW_WIDTH, WINDOW_HEIGHT):
+                        active_bullets.append(bullet)
+                    else:
+                        self.bullet_pool.release(bullet)
+                self.bullets = active_bullets
+                if profiler is not None:
+                    profiler.mark("bullets")
+                
+                # Update asteroids
+                for asteroid in self.asteroids:
+                    asteroid.update(WINDOW_WIDTH, WINDOW_HEIGHT)
+                if profiler is not None:
+                    profiler.mark("asteroids")
+                
+                # Check for collisions
+                self.check_collisions()
+                if profiler is not None:
+                    profiler.mark("collisions")
             
             # Handle asteroid spawning
-            current_time = pygame.time.get_ticks()
+            current_time = self.timer.get_ticks()
             if current_time - self.asteroid_spawn_timer > self.asteroid_spawn_delay:
                 self.asteroid_spawn_timer = current_time
-                max_asteroids = 5 + self.level * 2  # Increase max asteroids with level
+                max_asteroids = self.difficulty.max_asteroids(self.level)  # Increase max asteroids with level
                 if len(self.asteroids) < max_asteroids:
                     self.spawn_asteroid_away_from_player()
             
@@ -516,21 +862,37 @@ class Game:
             if len(self.asteroids) == 0:
                 self.level += 1
                 self.spawn_initial_asteroids(3 + self.level)  # Increase asteroids with level
+            if profiler is not None:
+                profiler.mark("spawning")
     
+    @traced()
     def check_collisions(self):
+        # Rebuild the broad phase grid from this tick's asteroid positions
+        grid = self.collision_grid
+        grid.rebuild(self.asteroids)
+        next_order = len(self.asteroids)
+        
+        # Hits are collected here and removed in one pass at the end
+        hit_bullets = set()
+        destroyed = set()
+        spawned = []
+        
         # Check collisions between bullets and asteroids
-        for bullet in self.bullets[:]:
-            for asteroid in self.asteroids[:]:
-                # Calculate distance between bullet and asteroid centers
+        for bullet in self.bullets:
+            bullet_radius = bullet.get_collision_radius()
+            for asteroid in grid.query(bullet.x, bullet.y, bullet_radius):
+                if id(asteroid) in destroyed:
+                    continue
+                
+                # Compare squared distance between bullet and asteroid centers
                 dist_x = bullet.x - asteroid.x
                 dist_y = bullet.y - asteroid.y
-                distance = math.sqrt(dist_x ** 2 + dist_y ** 2)
+                reach = bullet_radius + asteroid.get_collision_radius()
                 
                 # Check if they're colliding
-                if distance < bullet.get_collision_radius() + asteroid.get_collision_radius():
-                    # Remove the bullet
-                    if bullet in self.bullets:
-                        self.bullets.remove(bullet)
+                if dist_x * dist_x + dist_y * dist_y < reach * reach:
+                    # Mark the bullet for removal
+                    hit_bullets.add(id(bullet))
                     
                     # Add score based on asteroid size
                     self.score += (4 - asteroid.size) * 100
@@ -539,13 +901,15 @@ class Game:
                     if self.score > self.high_score:
                         self.high_score = self.score
                     
-                    # Split the asteroid
-                    new_asteroids = asteroid.split()
-                    self.asteroids.extend(new_asteroids)
+                    # Split the asteroid; fragments can be hit by later bullets
+                    for new_asteroid in asteroid.split(self.asteroid_pool):
+                        grid.insert(new_asteroid, new_asteroid.x, new_asteroid.y,
+                                    new_asteroid.get_collision_radius(), next_order)
+                        next_order += 1
+                        spawned.append(new_asteroid)
                     
-                    # Remove the hit asteroid
-                    if asteroid in self.asteroids:
-                        self.asteroids.remove(asteroid)
+                    # Mark the hit asteroid for removal
+                    destroyed.add(id(asteroid))
                     
                     # Break out of the inner loop since the bullet is gone
                     break
@@ -554,47 +918,143 @@ class Game:
         if not self.player.invulnerable:  # Only check if player is not invulnerable
             player_radius = self.player.get_collision_radius()
             
-            for asteroid in self.asteroids[:]:
-                # Calculate distance between player and asteroid centers
+            for asteroid in grid.query(self.player.x, self.player.y, player_radius):
+                if id(asteroid) in destroyed:
+                    continue
+                
+                # Compare squared distance between player and asteroid centers
                 dist_x = self.player.x - asteroid.x
                 dist_y = self.player.y - asteroid.y
-                distance = math.sqrt(dist_x ** 2 + dist_y ** 2)
+                reach = player_radius + asteroid.get_collision_radius()
                 
                 # Check if they're colliding
-                if distance < player_radius + asteroid.get_collision_radius():
+                if dist_x * dist_x + dist_y * dist_y < reach * reach:
                     # Handle player being hit
                     still_alive = self.player.hit()
                     if not still_alive:
                         # Game over
                         self.state = GAME_OVER
-                        return
+                        break
                     
                     # Break the asteroid
-                    new_asteroids = asteroid.split()
-                    self.asteroids.extend(new_asteroids)
-                    
-                    # Remove the hit asteroid
-                    if asteroid in self.asteroids:
-                        self.asteroids.remove(asteroid)
+                    spawned.extend(asteroid.split(self.asteroid_pool))
+                    destroyed.add(id(asteroid))
                     
                     # Only process one collision at a time
                     break
+        
+        # Apply all removals in one pass
+        if hit_bullets:
+            active_bullets = []
+            for bullet in self.bullets:
+                if id(bullet) in hit_bullets:
+                    self.bullet_pool.release(bullet)
+                else:
+                    active_bullets.append(bullet)
+            self.bullets = active_bullets
+        if destroyed or spawned:
+            survivors = []
+            for asteroid in self.asteroids + spawned:
+                if id(asteroid) in destroyed:
+                    self.forget_asteroid_image(asteroid)
+                    self.asteroid_pool.release(asteroid)
+                else:
+                    survivors.append(asteroid)
+            self.asteroids = survivors
 
-    def draw_background(self):
+    @traced()
+    def update_store(self):
+        store = self.store
+        profiler = self.profiler
+        store.step_bullets(self.timer.get_ticks(), WINDOW_WIDTH, WINDOW_HEIGHT)
+        if profiler is not None:
+            profiler.mark("bullets")
+        store.step_asteroids(WINDOW_WIDTH, WINDOW_HEIGHT)
+        if profiler is not None:
+            profiler.mark("asteroids")
+        
+        # Bullets against asteroids, resolved for the whole tick at once
+        bullet_slots, asteroid_slots = store.collide_bullets()
+        destroyed = set(asteroid_slots.tolist())
+        spawned = []
+        for slot in asteroid_slots.tolist():
+            asteroid = store.asteroid_views[slot]
+            self.score += (4 - asteroid.size) * 100
+            # Views expose x, y and size, which is all Asteroid.split reads
+            spawned.extend(Asteroid.split(asteroid, self.asteroid_pool))
+        store.remove_bullet_slots(bullet_slots)
+        if self.score > self.high_score:
+            self.high_score = self.score
+        
+        # Player against asteroids
+        if not self.player.invulnerable:
+            slot = store.collide_point(self.player.x, self.player.y, self.player.get_collision_radius(),
+                                       exclude=destroyed)
+            if slot >= 0:
+                if not self.player.hit():
+                    self.state = GAME_OVER
+                else:
+                    spawned.extend(Asteroid.split(store.asteroid_views[slot], self.asteroid_pool))
+                    destroyed.add(slot)
+        
+        # Remove destroyed asteroids in one pass, then add fragments
+        if destroyed:
+            for slot in destroyed:
+                self.forget_asteroid_image(store.asteroid_views[slot])
+            store.remove_asteroid_slots(list(destroyed))
+        for asteroid in spawned:
+            store.add_asteroid(asteroid)
+            self.asteroid_pool.release(asteroid)
+        
+        self.bullets = store.bullet_views
+        self.asteroids = store.asteroid_views
+        if profiler is not None:
+            profiler.mark("collisions")
+
+    def forget_asteroid_image(self, asteroid):
+        # Shared variant images stay cached; one-off images are dropped
+        if asteroid.variant_id is None:
+            rotation_cache.discard(asteroid.original_image)
+    
+    def pool_stats(self):
+        return {
+            "bullets": self.bullet_pool.stats(),
+            "asteroids": self.asteroid_pool.stats(),
+        }
+
+    def build_background(self):
         # Fill with black background
-        self.screen.fill(BLACK)
+        background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        background.fill(BLACK)
         
         # Draw a simple grid for reference (if enabled)
         if self.draw_grid:
             grid_spacing = 50
             for x in range(0, WINDOW_WIDTH, grid_spacing):
-                pygame.draw.line(self.screen, DARK_GRAY, (x, 0), (x, WINDOW_HEIGHT))
+                pygame.draw.line(background, DARK_GRAY, (x, 0), (x, WINDOW_HEIGHT))
             for y in range(0, WINDOW_HEIGHT, grid_spacing):
-                pygame.draw.line(self.screen, DARK_GRAY, (0, y), (WINDOW_WIDTH, y))
+                pygame.draw.line(background, DARK_GRAY, (0, y), (WINDOW_WIDTH, y))
+        
+        if pygame.display.get_surface() is not None:
+            background = background.convert()
+        self.background = background
+        self.full_redraw = True
+    
+    def draw_background(self):
+        # Copy the cached background and grid
+        self.screen.blit(self.background, (0, 0))
 
+    @traced()
     def draw(self):
+        if self.render_mode == RENDER_DIRTY and self.state == PLAYING:
+            self.draw_dirty()
+            return
+        
         # Draw background
+        profiler = self.profiler
         self.draw_background()
+        if profiler is not None:
+            profiler.mark("background")
         
         if self.state == MENU:
             self.draw_menu()
@@ -602,108 +1062,379 @@ class Game:
             self.draw_game()
         elif self.state == GAME_OVER:
             self.draw_game_over()
+        if profiler is not None:
+            profiler.mark("hud")
         
         # Update the display
-        pygame.display.flip()
+        if not self.headless:
+            pygame.display.flip()
+        if profiler is not None:
+            profiler.mark("flip")
+        self.last_drawn_state = self.state
+    
+    @traced()
+    def draw_dirty(self):
+        profiler = self.profiler
+        
+        # Repaint everything after a state change or background rebuild
+        if self.full_redraw or self.last_drawn_state != PLAYING:
+            self.draw_background()
+            if profiler is not None:
+                profiler.mark("background")
+            self.dirty_rects = self.draw_game()
+            if not self.headless:
+                pygame.display.flip()
+            if profiler is not None:
+                profiler.mark("flip")
+            self.full_redraw = False
+            self.last_drawn_state = PLAYING
+            return
+        
+        # Erase last frame's sprites by restoring the background under them
+        previous = self.dirty_rects
+        for rect in previous:
+            self.screen.blit(self.background, rect, rect)
+        if profiler is not None:
+            profiler.mark("background")
+        
+        # Draw this frame and push both old and new areas
+        current = self.draw_game()
+        self.dirty_rects = current
+        if self.headless:
+            return
+        changed = previous + current
+        area = sum(rect.width * rect.height for rect in changed)
+        if area > WINDOW_WIDTH * WINDOW_HEIGHT * DIRTY_FLIP_THRESHOLD:
+            pygame.display.flip()
+        else:
+            pygame.display.update(changed)
+        if profiler is not None:
+            profiler.mark("flip")
     
     def draw_menu(self):
         # Draw title
-        title = self.font_large.render("SPACE SHOOTER", True, WHITE)
+        title = self.render_text(self.font_large, "SPACE SHOOTER", WHITE)
         self.screen.blit(title, (WINDOW_WIDTH//2 - title.get_width()//2, 150))
         
         # Draw high score
-        high_score_text = self.font_medium.render(f"High Score: {self.high_score}", True, YELLOW)
+        high_score_text = self.render_text(self.font_medium, f"High Score: {self.high_score}", YELLOW)
         self.screen.blit(high_score_text, (WINDOW_WIDTH//2 - high_score_text.get_width()//2, 250))
         
         # Draw instructions
-        start_text = self.font_medium.render("Press SPACE to Start", True, WHITE)
+        start_text = self.render_text(self.font_medium, "Press SPACE to Start", WHITE)
         self.screen.blit(start_text, (WINDOW_WIDTH//2 - start_text.get_width()//2, 350))
         
-        quit_text = self.font_medium.render("Press ESC to Quit", True, WHITE)
+        quit_text = self.render_text(self.font_medium, "Press ESC to Quit", WHITE)
         self.screen.blit(quit_text, (WINDOW_WIDTH//2 - quit_text.get_width()//2, 400))
         
         # Draw controls
-        controls_text = self.font_small.render("Controls: Arrow Keys to Move, A/D to Rotate, SPACE to Shoot", True, CYAN)
+        controls_text = self.render_text(self.font_small, "Controls: Arrow Keys to Move, A/D to Rotate, SPACE to Shoot", CYAN)
         self.screen.blit(controls_text, (WINDOW_WIDTH//2 - controls_text.get_width()//2, 500))
     
+    @traced()
     def draw_game(self):
+        # Returns the screen areas drawn this frame
+        screen = self.screen
+        
         # Draw asteroids
-        for asteroid in self.asteroids:
-            asteroid.draw(self.screen)
+        rects = [asteroid.draw(screen) for asteroid in self.asteroids]
         
         # Draw bullets
-        for bullet in self.bullets:
-            bullet.draw(self.screen)
+        rects.extend([bullet.draw(screen) for bullet in self.bullets])
         
         # Draw player
-        self.player.draw(self.screen)
+        rects.extend(self.player.draw(screen))
+        if self.profiler is not None:
+            self.profiler.mark("entities")
         
         # Draw HUD (Heads Up Display)
-        self.draw_hud()
+        rects.extend(self.draw_hud())
+        if self.show_profiler:
+            rects.append(self.draw_profiler_overlay())
+        if self.profiler is not None:
+            self.profiler.mark("hud")
+        
+        return rects
     
     def draw_game_over(self):
         # Draw the game objects in the background
         self.draw_game()
         
         # Draw semi-transparent overlay
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))  # Black with opacity
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self.overlay, (0, 0))
         
         # Draw Game Over text
-        gameover_text = self.font_large.render("GAME OVER", True, RED)
+        gameover_text = self.render_text(self.font_large, "GAME OVER", RED)
         self.screen.blit(gameover_text, (WINDOW_WIDTH//2 - gameover_text.get_width()//2, 150))
         
         # Draw the score
-        score_text = self.font_medium.render(f"Your Score: {self.score}", True, WHITE)
+        score_text = self.render_text(self.font_medium, f"Your Score: {self.score}", WHITE)
         self.screen.blit(score_text, (WINDOW_WIDTH//2 - score_text.get_width()//2, 250))
         
         # Draw the high score
         if self.score >= self.high_score:
-            high_score_text = self.font_medium.render(f"New High Score!", True, YELLOW)
+            high_score_text = self.render_text(self.font_medium, f"New High Score!", YELLOW)
         else:
-            high_score_text = self.font_medium.render(f"High Score: {self.high_score}", True, YELLOW)
+            high_score_text = self.render_text(self.font_medium, f"High Score: {self.high_score}", YELLOW)
         self.screen.blit(high_score_text, (WINDOW_WIDTH//2 - high_score_text.get_width()//2, 300))
         
         # Draw restart instructions
-        restart_text = self.font_medium.render("Press SPACE to Restart", True, WHITE)
+        restart_text = self.render_text(self.font_medium, "Press SPACE to Restart", WHITE)
         self.screen.blit(restart_text, (WINDOW_WIDTH//2 - restart_text.get_width()//2, 400))
         
-        menu_text = self.font_medium.render("Press ESC for Main Menu", True, WHITE)
+        menu_text = self.render_text(self.font_medium, "Press ESC for Main Menu", WHITE)
         self.screen.blit(menu_text, (WINDOW_WIDTH//2 - menu_text.get_width()//2, 450))
     
-    def draw_hud(self):
+    def record_replay_tick(self, keys):
+        if self.replay_dir is None:
+            return
+        
+        if self.recorder is None:
+            # Start recording from the state after a new game's first tick
+            if self.state == PLAYING:
+                self.recorder = ReplayWriter(self.new_replay_path(), self)
+            return
+        
+        # Leaving for the menu ends the replay without this tick;
+        # the tick that caused game over is kept
+        if self.state != MENU:
+            self.recorder.record(encode_inputs(keys, self.shoot_pressed))
+        if self.state != PLAYING:
+            self.recorder.close()
+            self.recorder = None
+    
+    def new_replay_path(self):
+        os.makedirs(self.replay_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.replay_dir, f"replay-{stamp}-{self.seed}.ssr")
+        count = 1
+        while os.path.exists(path):
+            count += 1
+            path = os.path.join(self.replay_dir, f"replay-{stamp}-{self.seed}-{count}.ssr")
+        return path
+    
+    def snapshot(self, quantize=True):
+        # Compact binary copy of the simulation state
+        return take_snapshot(self, quantize)
+    
+    def restore_snapshot(self, data):
+        restore_snapshot(self, data)
+    
+    def run_idle_frame(self):
+        # Static screens only change on input, so redraw once and then sleep
+        # in pygame.event.wait until something happens
+        if self.needs_redraw or self.last_drawn_state != self.state:
+            self.draw()
+            self.needs_redraw = False
+        
+        event = pygame.event.wait(IDLE_WAIT_TIMEOUT)
+        if event.type == pygame.NOEVENT:
+            return
+        self.handle_event(event)
+        self.handle_events()
+        
+        # Pointer movement does not change what is shown
+        if event.type != pygame.MOUSEMOTION:
+            self.needs_redraw = True
+        
+        # Restart fixed-rate ticking from now rather than from before the wait
+        if self.state == PLAYING:
+            self.clock.tick()
+    
+    def toggle_profiler_overlay(self):
+        self.show_profiler = not self.show_profiler
+        if self.show_profiler and self.profiler is None:
+            self.profiler = FrameProfiler()
+        elif not self.show_profiler and self.profiler.file is None:
+            # Nothing left to collect for; drop back to zero overhead
+            self.profiler = None
+        self.profiler_panel = None
+        self.full_redraw = True
+    
+    def build_profiler_panel(self):
+        # One line per phase with rolling p50/p95/p99 in milliseconds
+        if self.profiler_font is None:
+            self.profiler_font = pygame.font.SysFont("monospace", 14)
+        font = self.profiler_font
+        lines = [f"{'phase':<11}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for phase, (p50, p95, p99) in self.profiler.percentiles().items():
+            lines.append(f"{phase:<11}{p50:>7.2f}{p95:>7.2f}{p99:>7.2f}")
+        
+        line_height = font.get_linesize()
+        width = max(font.size(line)[0] for line in lines) + 12
+        panel = pygame.Surface((width, line_height * len(lines) + 12), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        for i, line in enumerate(lines):
+            panel.blit(font.render(line, True, WHITE), (6, 6 + i * line_height))
+        self.profiler_panel = panel
+    
+    def draw_profiler_overlay(self):
+        # Percentiles are re-rendered a few times a second, not every frame
+        if self.profiler_panel is None or self.profiler.frames % PROFILER_REFRESH_FRAMES == 0:
+            self.build_profiler_panel()
+        return self.screen.blit(self.profiler_panel, (20, 90))
+    
+    def render_text(self, font, text, color):
+        return self.text_cache.render(font, text, color)
+    
+    def build_hud_panel(self):
+        # Compose lives, score and level into one surface
+        panel = pygame.Surface((WINDOW_WIDTH, 80), pygame.SRCALPHA)
+        
         # Draw score
-        score_text = self.font_small.render(f"Score: {self.score}", True, WHITE)
-        self.screen.blit(score_text, (WINDOW_WIDTH - score_text.get_width() - 20, 20))
+        score_text = self.render_text(self.font_small, f"Score: {self.score}", WHITE)
+        score_rect = panel.blit(score_text, (WINDOW_WIDTH - score_text.get_width() - 20, 20))
         
         # Draw level
-        level_text = self.font_small.render(f"Level: {self.level}", True, WHITE)
-        self.screen.blit(level_text, (WINDOW_WIDTH - level_text.get_width() - 20, 50))
+        level_text = self.render_text(self.font_small, f"Level: {self.level}", WHITE)
+        level_rect = panel.blit(level_text, (WINDOW_WIDTH - level_text.get_width() - 20, 50))
         
         # Draw lives
-        lives_text = self.font_small.render("Lives: ", True, WHITE)
-        self.screen.blit(lives_text, (20, 20))
-        self.player.draw_lives(self.screen, 90, 20)
+        lives_text = self.render_text(self.font_small, "Lives: ", WHITE)
+        lives_rect = panel.blit(lives_text, (20, 20))
+        for rect in self.player.draw_lives(panel, 90, 20):
+            lives_rect.union_ip(rect)
+        
+        # Only the areas holding content are copied to the screen
+        self.hud_panel = panel
+        self.hud_rects = [lives_rect, score_rect.union(level_rect)]
+    
+    @traced()
+    def draw_hud(self):
+        # Returns the screen areas drawn
+        hud_key = (self.score, self.level, self.player.lives)
+        if hud_key != self.hud_key:
+            self.build_hud_panel()
+            self.hud_key = hud_key
+        rects = [self.screen.blit(self.hud_panel, rect.topleft, rect) for rect in self.hud_rects]
         
         # Draw controls reminder at the bottom
-        controls_text = self.font_small.render("Arrow Keys: Move   A/D: Rotate   SPACE: Shoot   G: Grid   ESC: Menu", True, DARK_GRAY)
-        self.screen.blit(controls_text, (WINDOW_WIDTH//2 - controls_text.get_width()//2, WINDOW_HEIGHT - 30))
+        controls_text = self.render_text(self.font_small, "Arrow Keys: Move   A/D: Rotate   SPACE: Shoot   G: Grid   F3: Profiler   ESC: Menu", DARK_GRAY)
+        rects.append(self.screen.blit(controls_text, (WINDOW_WIDTH//2 - controls_text.get_width()//2, WINDOW_HEIGHT - 30)))
+        
+        return rects
     
     def run(self):
+        # An autopilot skips the menu, and starts the next game straight
+        # after a game over; ESC still leaves for the menu
+        if self.autopilot is not None and self.state == MENU:
+            self.start_new_game()
         while self.running:
+            if self.autopilot is not None and self.state == GAME_OVER:
+                self.start_new_game()
+            
+            if self.idle_wait and self.state != PLAYING:
+                self.run_idle_frame()
+                continue
+            
+            # Simulated clocks advance one fixed tick per frame
+            if hasattr(self.timer, "advance"):
+                self.timer.advance(self.tick_ms)
+            
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.begin_frame()
+            self.shoot_pressed = False
             self.handle_events()
-            self.update()
+            if profiler is not None:
+                profiler.mark("events")
+            keys = self.read_keys()
+            self.update(keys)
+            self.record_replay_tick(keys)
+            if profiler is not None:
+                profiler.skip()
             self.draw()
+            if profiler is not None:
+                profiler.end_frame()
             self.clock.tick(FPS)
+        
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.profiler is not None:
+            self.profiler.close()
 
         pygame.quit()
         sys.exit()
 
 # Run the game
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Space Shooter")
+    parser.add_argument("--render", choices=[RENDER_FULL, RENDER_DIRTY], default=RENDER_FULL,
+                        help="full: flip the whole window every frame; "
+                             "dirty: push only changed areas (for software-rendered displays)")
+    parser.add_argument("--seed", type=int, help="Seed for the game's random streams")
+    parser.add_argument("--record", metavar="DIR", help="Write a replay of every game played to DIR")
+    parser.add_argument("--replay", metavar="FILE", help="Play a replay headless and print the result")
+    parser.add_argument("--autopilot", choices=sorted(PILOTS), help="Let a scripted pilot play")
+    parser.add_argument("--stress", action="store_true",
+                        help=f"Ramp asteroid counts and report where frames exceed {FRAME_BUDGET_MS:.1f} ms")
+    parser.add_argument("--stress-start", type=int, default=50, help="Asteroids in the first stress stage")
+    parser.add_argument("--stress-step", type=int, default=50, help="Asteroids added per stress stage")
+    parser.add_argument("--stress-max", type=int, default=5000, help="Largest asteroid count to try")
+    parser.add_argument("--stress-frames", type=int, default=120, help="Frames per stress stage")
+    parser.add_argument("--bullet-rate", type=float, default=60, help="Bullets fired per second in stress mode")
+    parser.add_argument("--profile-csv", metavar="FILE",
+                        help="Write per-frame phase timings to a CSV file (F3 shows them on screen)")
+    parser.add_argument("--sample-profile", metavar="FILE",
+                        help="Sample the main thread's stack and write collapsed stacks to FILE on exit "
+                             "(and on SIGUSR1)")
+    parser.add_argument("--sample-rate", type=float, default=100, help="Stack samples per second")
+    parser.add_argument("--asteroid-variants", type=int, default=8, metavar="N",
+                        help="Pre-drawn asteroid shapes per size (0 draws every asteroid on spawn)")
+    parser.add_argument("--asteroid-bank", metavar="FILE",
+                        help="Load the asteroid variant bank from FILE, generating and saving it if missing")
+    parser.add_argument("--atlas", metavar="FILE",
+                        help="Load sprites from a texture atlas (static/atlas.json, built by setup_assets.py)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Record spans and write Chrome trace-event JSON to FILE on exit "
+                             "(open in ui.perfetto.dev)")
+    parser.add_argument("--headless", action="store_true", help="Render offscreen (stress mode only)")
+    parser.add_argument("--no-idle-wait", dest="idle_wait", action="store_false",
+                        help="Keep ticking at full FPS on the menu and game over screens")
+    return parser.parse_args(argv)
+
+def play_replay(path):
+    # Re-simulate a recorded game without a window as fast as possible
+    reader = ReplayReader(path)
+    game = reader.make_game(Game, Difficulty)
+    start = time.perf_counter()
+    reader.play(game)
+    elapsed = time.perf_counter() - start
+    ticks = reader.tick_count
+    game_seconds = ticks * reader.header["tick_ms"] / 1000
+    print(f"Replayed {ticks} ticks ({game_seconds:.1f} s of play) in {elapsed:.2f} s "
+          f"({game_seconds / max(elapsed, 1e-9):.0f}x real time)")
+    print(f"Final score: {game.score}, level: {game.level}, lives: {game.player.lives}")
+
 if __name__ == "__main__":
+    args = parse_args()
+    if args.sample_profile:
+        # Runs on its own thread; stacks are written however the process exits
+        sampler = SamplingProfiler(args.sample_profile, rate=args.sample_rate)
+        sampler.install_signal_handler()
+        sampler.start()
+        atexit.register(sampler.stop)
+    if args.trace:
+        trace_to(args.trace)
+    if args.replay:
+        play_replay(args.replay)
+        sys.exit(0)
+    if args.stress:
+        # Fixed simulated ticks, so bullet lifetimes do not depend on frame time
+        game = Game(headless=args.headless, timer=SimClock(), seed=args.seed,
+                    render_mode=args.render, idle_wait=False, asteroid_variants=args.asteroid_variants,
+                    asteroid_bank_path=args.asteroid_bank)
+        run_stress(game, start=args.stress_start, step=args.stress_step, maximum=args.stress_max,
+                   stage_frames=args.stress_frames, bullet_rate=args.bullet_rate)
+        pygame.quit()
+        sys.exit(0)
     try:
-        game = Game()
+        autopilot = make_pilot(args.autopilot, args.seed) if args.autopilot else None
+        profiler = FrameProfiler(csv_path=args.profile_csv) if args.profile_csv else None
+        game = Game(render_mode=args.render, idle_wait=args.idle_wait,
+                    seed=args.seed, replay_dir=args.record, autopilot=autopilot,
+                    profiler=profiler, atlas_path=args.atlas, asteroid_variants=args.asteroid_variants,
+                    asteroid_bank_path=args.asteroid_bank)
         game.run()
     except Exception as e:
         print(f"Error: {e}")
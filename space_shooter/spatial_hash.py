@@ -0,0 +1,73 @@
+"""Uniform-grid spatial hash used as the collision broad phase.
+
+Cell coordinates wrap around the screen the same way asteroids do, so
+objects sitting just past an edge still land in a bounded grid.
+"""
+
+
+class SpatialHash:
+    def __init__(self, width, height, cell_size=64):
+        # Grid dimensions
+        self.cell_size = cell_size
+        self.cols = max(1, -(-width // cell_size))
+        self.rows = max(1, -(-height // cell_size))
+
+        # Cell index -> list of (order, item)
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def _cell_range(self, x, y, radius):
+        # Cells covered by the circle's bounding box, wrapped onto the grid
+        size = self.cell_size
+        cols = self.cols
+        rows = self.rows
+        min_col = int((x - radius) // size)
+        max_col = int((x + radius) // size)
+        min_row = int((y - radius) // size)
+        max_row = int((y + radius) // size)
+
+        # A circle wider than the grid touches every column or row once
+        if max_col - min_col >= cols:
+            col_range = range(cols)
+        else:
+            col_range = [col % cols for col in range(min_col, max_col + 1)]
+        if max_row - min_row >= rows:
+            row_range = range(rows)
+        else:
+            row_range = [row % rows for row in range(min_row, max_row + 1)]
+
+        for row in row_range:
+            for col in col_range:
+                yield row * cols + col
+
+    def insert(self, item, x, y, radius, order=0):
+        """Add an item covering the circle at (x, y)."""
+        cells = self.cells
+        entry = (order, item)
+        for cell in self._cell_range(x, y, radius):
+            bucket = cells.get(cell)
+            if bucket is None:
+                cells[cell] = [entry]
+            else:
+                bucket.append(entry)
+
+    def rebuild(self, items):
+        """Rebuild the grid from objects with x, y and get_collision_radius()."""
+        self.cells.clear()
+        for order, item in enumerate(items):
+            self.insert(item, item.x, item.y, item.get_collision_radius(), order)
+
+    def query(self, x, y, radius):
+        """Return candidate items near the circle, in insertion order."""
+        cells = self.cells
+        found = {}
+        for cell in self._cell_range(x, y, radius):
+            bucket = cells.get(cell)
+            if bucket:
+                for order, item in bucket:
+                    found[order] = item
+        if len(found) > 1:
+            return [found[order] for order in sorted(found)]
+        return list(found.values())
@@ -0,0 +1,308 @@
+const WINDOW_WIDTH = 800;
+const WINDOW_HEIGHT = 600;
+const BLACK = 0x000000;
+const WHITE = 0xFFFFFF;
+const DARK_GRAY = 0x141414;
+const CYAN = 0x00FFFF;
+const ORANGE = 0xFF6400;
+const YELLOW = 0xFFFF64;
+const RED = 0xFF3232;
+const GREEN = 0x32FF32;
+
+// Game States
+const MENU = 0;
+const PLAYING = 1;
+const GAME_OVER = 2;
+
+// Atlas URLs are passed on the script tag, fingerprinted by the server
+const ATLAS_URLS = document.currentScript.dataset;
+
+class SpaceShooterScene extends Phaser.Scene {
+    constructor() {
+        super('SpaceShooterScene');
+        this.state = MENU;
+        this.score = 0;
+        this.highScore = 0;
+        this.level = 1;
+        this.drawGrid = true;
+    }
+
+    preload() {
+        // Every sprite comes from one atlas built by setup_assets.py
+        this.load.atlas('sprites', ATLAS_URLS.atlasImage, ATLAS_URLS.atlasJson);
+    }
+
+    create() {
+        // Background
+        this.cameras.main.setBackgroundColor(BLACK);
+
+        // Asteroid frame names by size class, e.g. asteroid_3_0
+        this.asteroidFrames = { 1: [], 2: [], 3: [] };
+        this.textures.get('sprites').getFrameNames().forEach(name => {
+            const match = /^asteroid_(\d)_/.exec(name);
+            if (match) this.asteroidFrames[match[1]].push(name);
+        });
+
+        // Create groups
+        this.asteroidsGroup = this.physics.add.group();
+        this.bulletsGroup = this.physics.add.group();
+
+        // Create player
+        this.player = this.createPlayer();
+
+        // Text
+        this.scoreText = this.add.text(16, 16, 'Score: 0', { fontSize: '24px', fill: '#fff' });
+        this.levelText = this.add.text(16, 50, 'Level: 1', { fontSize: '24px', fill: '#fff' });
+        this.livesText = this.add.text(16, 84, 'Lives: 3', { fontSize: '24px', fill: '#fff' });
+
+        // Menu text
+        this.menuText = this.add.text(
+            WINDOW_WIDTH / 2, 
+            WINDOW_HEIGHT / 2, 
+            'SPACE SHOOTER\n\nPress SPACE to Start', 
+            { 
+                fontSize: '32px', 
+                fill: '#fff', 
+                align: 'center' 
+            }
+        ).setOrigin(0.5);
+
+        // Input
+        this.cursors = this.input.keyboard.createCursorKeys();
+        this.aKey = this.input.keyboard.addKey(Phaser.Input.Keyboard.KeyCodes.A);
+        this.dKey = this.input.keyboard.addKey(Phaser.Input.Keyboard.KeyCodes.D);
+        this.gKey = this.input.keyboard.addKey(Phaser.Input.Keyboard.KeyCodes.G);
+        this.spaceKey = this.input.keyboard.addKey(Phaser.Input.Keyboard.KeyCodes.SPACE);
+        this.escKey = this.input.keyboard.addKey(Phaser.Input.Keyboard.KeyCodes.ESC);
+
+        // Collision detection
+        this.physics.add.collider(this.bulletsGroup, this.asteroidsGroup, this.handleBulletAsteroidCollision, null, this);
+        this.physics.add.collider(this.player, this.asteroidsGroup, this.handlePlayerAsteroidCollision, null, this);
+    }
+
+    createPlayer() {
+        const player = this.physics.add.sprite(WINDOW_WIDTH / 2, WINDOW_HEIGHT - 100, 'sprites', 'player_ship');
+        player.setCollideWorldBounds(true);
+        player.lives = 3;
+        player.angle = 0;
+        return player;
+    }
+
+    update() {
+        if (Phaser.Input.Keyboard.JustDown(this.gKey)) {
+            this.drawGrid = !this.drawGrid;
+        }
+
+        if (this.state === MENU) {
+            this.handleMenuInput();
+            return;
+        }
+
+        if (this.state === PLAYING) {
+            this.handlePlayerMovement();
+            this.handleShooting();
+            this.wrapAsteroids();
+        }
+
+        if (this.state === GAME_OVER) {
+            this.handleGameOverInput();
+        }
+    }
+
+    handleMenuInput() {
+        if (Phaser.Input.Keyboard.JustDown(this.spaceKey)) {
+            this.startNewGame();
+        }
+    }
+
+    startNewGame() {
+        this.state = PLAYING;
+        this.score = 0;
+        this.level = 1;
+        this.scoreText.setText('Score: 0');
+        this.levelText.setText('Level: 1');
+        this.livesText.setText('Lives: 3');
+        this.menuText.setVisible(false);
+
+        // Clear existing asteroids and bullets
+        this.asteroidsGroup.clear(true, true);
+        this.bulletsGroup.clear(true, true);
+
+        // Reset player
+        this.player.destroy();
+        this.player = this.createPlayer();
+
+        // Spawn initial asteroids
+        this.spawnInitialAsteroids(5);
+    }
+
+    handlePlayerMovement() {
+        // Movement
+        this.player.setVelocity(0);
+        if (this.cursors.left.isDown) {
+            this.player.setVelocityX(-300);
+        } else if (this.cursors.right.isDown) {
+            this.player.setVelocityX(300);
+        }
+
+        if (this.cursors.up.isDown) {
+            this.player.setVelocityY(-300);
+        } else if (this.cursors.down.isDown) {
+            this.player.setVelocityY(300);
+        }
+
+        // Rotation
+        if (this.aKey.isDown) {
+            this.player.angle -= 3;
+        }
+        if (this.dKey.isDown) {
+            this.player.angle += 3;
+        }
+    }
+
+    handleShooting() {
+        if (this.spaceKey.isDown) {
+            this.shootBullet();
+        }
+    }
+
+    shootBullet() {
+        const time = this.time.now;
+        if (!this.lastBulletTime || time - this.lastBulletTime > 250) {
+            // Calculate bullet spawn position
+            const angle = Phaser.Math.DegToRad(this.player.angle - 90);
+            const bulletX = this.player.x + Math.cos(angle) * 25;
+            const bulletY = this.player.y + Math.sin(angle) * 25;
+
+            const bullet = this.bulletsGroup.create(bulletX, bulletY, 'sprites', 'bullet');
+            bullet.setVelocity(
+                Math.cos(angle) * 500, 
+                Math.sin(angle) * 500
+            );
+
+            this.lastBulletTime = time;
+
+            // Remove bullet after 2 seconds
+            this.time.delayedCall(2000, () => {
+                if (bullet.active) bullet.destroy();
+            });
+        }
+    }
+
+    spawnInitialAsteroids(count) {
+        for (let i = 0; i < count; i++) {
+            this.spawnAsteroid(3);
+        }
+    }
+
+    spawnAsteroid(size) {
+        const x = Phaser.Math.Between(0, WINDOW_WIDTH);
+        const y = Phaser.Math.Between(0, WINDOW_HEIGHT / 2);
+        const frame = Phaser.Utils.Array.GetRandom(this.asteroidFrames[size]);
+        const asteroid = this.asteroidsGroup.create(x, y, 'sprites', frame);
+
+        const speed = 4 - size;
+        const angle = Phaser.Math.DegToRad(Phaser.Math.Between(0, 360));
+        asteroid.setVelocity(
+            Math.cos(angle) * speed * 100, 
+            Math.sin(angle) * speed * 100
+        );
+        asteroid.size = size;
+        asteroid.setAngularVelocity(Phaser.Math.Between(-50, 50));
+    }
+
+    wrapAsteroids() {
+        this.asteroidsGroup.children.entries.forEach(asteroid => {
+            if (asteroid.x > WINDOW_WIDTH) asteroid.x = 0;
+            if (asteroid.x < 0) asteroid.x = WINDOW_WIDTH;
+            if (asteroid.y > WINDOW_HEIGHT) asteroid.y = 0;
+            if (asteroid.y < 0) asteroid.y = WINDOW_HEIGHT;
+        });
+    }
+
+    handleBulletAsteroidCollision(bullet, asteroid) {
+        bullet.destroy();
+        asteroid.destroy();
+
+        // Increase score
+        this.score += (4 - asteroid.size) * 100;
+        this.scoreText.setText(`Score: ${this.score}`);
+
+        // Update high score
+        if (this.score > this.highScore) {
+            this.highScore = this.score;
+        }
+
+        // Split asteroid
+        if (asteroid.size > 1) {
+            this.spawnAsteroid(asteroid.size - 1);
+            this.spawnAsteroid(asteroid.size - 1);
+        }
+
+        // Level progression
+        if (this.asteroidsGroup.getChildren().length === 0) {
+            this.level++;
+            this.levelText.setText(`Level: ${this.level}`);
+            this.spawnInitialAsteroids(3 + this.level);
+        }
+    }
+
+    handlePlayerAsteroidCollision(player, asteroid) {
+        asteroid.destroy();
+
+        // Reduce lives
+        player.lives--;
+        this.livesText.setText(`Lives: ${player.lives}`);
+
+        // Check game over
+        if (player.lives <= 0) {
+            this.state = GAME_OVER;
+            this.menuText.setText(`GAME OVER\n\nScore: ${this.score}\nHigh Score: ${this.highScore}\n\nPress SPACE to Restart`);
+            this.menuText.setVisible(true);
+        }
+    }
+
+    handleGameOverInput() {
+        if (Phaser.Input.Keyboard.JustDown(this.spaceKey)) {
+            this.startNewGame();
+        }
+    }
+
+    render() {
+        if (this.drawGrid) {
+            const graphics = this.add.graphics();
+            graphics.lineStyle(1, DARK_GRAY);
+
+            // Vertical lines
+            for (let x = 0; x < WINDOW_WIDTH; x += 50) {
+                graphics.moveTo(x, 0);
+                graphics.lineTo(x, WINDOW_HEIGHT);
+            }
+
+            // Horizontal lines
+            for (let y = 0; y < WINDOW_HEIGHT; y += 50) {
+                graphics.moveTo(0, y);
+                graphics.lineTo(WINDOW_WIDTH, y);
+            }
+
+            graphics.strokePath();
+        }
+    }
+}
+
+const config = {
+    type: Phaser.AUTO,
+    width: WINDOW_WIDTH,
+    height: WINDOW_HEIGHT,
+    parent: 'phaser-game',
+    physics: {
+        default: 'arcade',
+        arcade: {
+            gravity: { y: 0 },
+            debug: false
+        }
+    },
+    scene: SpaceShooterScene
+};
+
+const game = new Phaser.Game(config);
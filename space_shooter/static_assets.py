@@ -0,0 +1,152 @@
+"""Preloaded, fingerprinted and precompressed static files for app.py.
+
+Everything under static/ is read once at startup (with `gunicorn
+--preload`, before the workers fork, so they share the pages). Each file
+gets a content hash, which serves as its ETag and is also part of a
+fingerprinted URL:
+
+    /static/bullet.png               no-cache, revalidated with the ETag
+    /static/bullet.3f2a9c01d4e6.png  cached for a year, immutable
+
+Text-like files also keep gzip (and brotli, if installed) copies when
+those are meaningfully smaller. Requests are answered from memory with
+304s for matching If-None-Match and 206s for Range requests. Files over
+PRELOAD_LIMIT stay on disk and go out through send_file, which uses the
+server's sendfile support.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from flask import Response, send_file
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; only needed for br variants
+    brotli = None
+
+# Files larger than this are streamed from disk instead of kept in memory
+PRELOAD_LIMIT = 1024 * 1024
+
+# Compressed copies are kept only when at most this share of the original
+COMPRESSION_KEEP_RATIO = 0.9
+
+# Hex digits of the content hash used in fingerprinted names
+FINGERPRINT_LENGTH = 12
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Preferred encodings, best first
+ENCODINGS = ("br", "gzip")
+
+
+def is_compressible(mimetype):
+    return (mimetype.startswith("text/") or mimetype.endswith(("+xml", "json", "javascript"))
+            or mimetype == "image/svg+xml")
+
+
+def compress(data, encoding):
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, quality=11)
+
+
+class StaticAsset:
+    def __init__(self, path, data=None, size=None, digest=None):
+        self.path = path
+        self.data = data  # None when served from disk
+        self.size = len(data) if data is not None else size
+        self.mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.etag = digest[:32]
+
+        # Precompressed bodies by content coding
+        self.variants = {}
+        if data is not None and is_compressible(self.mimetype):
+            for encoding in ENCODINGS:
+                if encoding == "br" and brotli is None:
+                    continue
+                compressed = compress(data, encoding)
+                if len(compressed) <= len(data) * COMPRESSION_KEEP_RATIO:
+                    self.variants[encoding] = compressed
+
+    def negotiate(self, request):
+        """Return (encoding, body) for the best representation the client accepts."""
+        # Ranges are only offered on the identity body
+        if self.variants and "Range" not in request.headers:
+            accepted = request.accept_encodings
+            for encoding in ENCODINGS:
+                if encoding in self.variants and accepted[encoding]:
+                    return encoding, self.variants[encoding]
+        return None, self.data
+
+    def respond(self, request, cache_control):
+        """Answer request from memory, with 304 and Range handling."""
+        encoding, body = self.negotiate(request)
+        response = Response(body, mimetype=self.mimetype)
+        response.headers["Cache-Control"] = cache_control
+        if self.variants:
+            response.headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            # Each coding is a different representation with its own strong ETag
+            response.headers["Content-Encoding"] = encoding
+            response.set_etag(f"{self.etag}-{encoding}")
+        else:
+            response.set_etag(self.etag)
+        return response.make_conditional(request, accept_ranges=encoding is None,
+                                         complete_length=len(body))
+
+
+class StaticAssets:
+    def __init__(self, directory, immutable=()):
+        self.directory = directory
+        self.assets = {}  # URL path -> StaticAsset, for plain and fingerprinted names
+        self.fingerprinted = {}  # plain path -> fingerprinted path
+        self.immutable = set(immutable)  # Paths already named by content, e.g. built bundles
+        self.load()
+
+    def load(self):
+        for root, _, files in os.walk(self.directory):
+            for name in sorted(files):
+                full_path = os.path.join(root, name)
+                path = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+                self.add(path, full_path)
+
+    def add(self, path, full_path):
+        size = os.path.getsize(full_path)
+        digest = hashlib.sha256()
+        data = None
+        with open(full_path, "rb") as f:
+            if size <= PRELOAD_LIMIT:
+                data = f.read()
+                digest.update(data)
+            else:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+        asset = StaticAsset(path, data, size, digest.hexdigest())
+
+        stem, extension = os.path.splitext(path)
+        fingerprinted = f"{stem}.{asset.etag[:FINGERPRINT_LENGTH]}{extension}"
+        self.assets[path] = asset
+        self.assets[fingerprinted] = asset
+        self.fingerprinted[path] = fingerprinted
+
+    def url(self, path):
+        """Return the fingerprinted /static URL for path (plain if unknown)."""
+        return f"/static/{self.fingerprinted.get(path, path)}"
+
+    def response(self, path, request):
+        """Build the response for /static/<path>, or return None if there is no such file."""
+        asset = self.assets.get(path)
+        if asset is None:
+            return None
+        immutable = path != asset.path or path in self.immutable
+
+        if asset.data is None:
+            response = send_file(os.path.join(self.directory, asset.path), mimetype=asset.mimetype,
+                                 etag=asset.etag, conditional=True)
+            response.headers["Cache-Control"] = IMMUTABLE if immutable else REVALIDATE
+            return response
+
+        return asset.respond(request, IMMUTABLE if immutable else REVALIDATE)
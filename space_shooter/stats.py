@@ -0,0 +1,7 @@
+"""Small statistics helpers shared by the measurement tools."""
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    index = min(len(values) - 1, max(0, int(round(fraction * (len(values) - 1)))))
+    return values[index]
@@ -0,0 +1,155 @@
+"""Stress mode: ramp entity counts until frames miss their budget.
+
+The game keeps N asteroids on screen and fires bullets at a fixed rate,
+raising N every stage. Each stage reports the mean milliseconds per
+frame spent in update, collision, rotation and blit, and the run ends
+with the counts at which the frame (and each subsystem alone) crossed
+the 60 FPS budget.
+"""
+import time
+
+from rotation_cache import rotation_cache
+from stats import percentile
+from timing import PhaseTimer
+
+# Milliseconds available per frame at 60 FPS
+FRAME_BUDGET_MS = 1000 / 60
+
+SUBSYSTEMS = ("update", "collision", "rotation", "blit")
+
+
+class StressTest:
+    def __init__(self, game, start=50, step=50, maximum=5000, stage_frames=120,
+                 bullet_rate=60, stop_factor=3.0):
+        self.game = game
+        self.count = start
+        self.step = step
+        self.maximum = maximum
+        self.stage_frames = stage_frames
+        self.bullet_rate = bullet_rate  # Bullets per second
+        self.stop_factor = stop_factor  # Stop once frames take this many budgets
+        self.bullet_credit = 0.0
+        self.bullet_angle = 0.0
+        self.stages = []
+
+    def prepare(self):
+        # Keep the player alive for the whole run
+        game = self.game
+        game.start_new_game()
+        player = game.player
+        player.invulnerable_duration = float("inf")
+        player.hit()
+        player.lives = player.max_lives
+
+    def top_up(self):
+        # Replace destroyed asteroids so the count stays at the stage's N
+        game = self.game
+        while len(game.asteroids) < self.count:
+            game.spawn_asteroid_away_from_player()
+
+    def fire(self):
+        # Spray bullets from the ship, sweeping around the circle
+        game = self.game
+        player = game.player
+        self.bullet_credit += self.bullet_rate * game.tick_ms / 1000
+        while self.bullet_credit >= 1:
+            self.bullet_credit -= 1
+            self.bullet_angle = (self.bullet_angle + 137.5) % 360  # Golden angle
+            bullet = game.bullet_pool.acquire(player.x, player.y, self.bullet_angle, timer=game.timer)
+            game.add_bullet(bullet)
+
+    def run_stage(self):
+        """Play one stage and return its per-subsystem timings."""
+        game = self.game
+        totals = dict.fromkeys(SUBSYSTEMS, 0.0)
+        frame_times = []
+        asteroids = bullets = 0
+
+        for _ in range(self.stage_frames):
+            # Keep a window responsive; closing it ends the run
+            if not game.headless:
+                game.handle_events()
+                if not game.running:
+                    break
+            self.top_up()
+            self.fire()
+
+            collisions_before = game.check_collisions.elapsed
+            rotation_before = rotation_cache.rotate.elapsed
+            start = time.perf_counter()
+            game.step()
+            update_done = time.perf_counter()
+            game.draw()
+            draw_done = time.perf_counter()
+
+            collision_time = game.check_collisions.elapsed - collisions_before
+            rotation_time = rotation_cache.rotate.elapsed - rotation_before
+            totals["update"] += update_done - start - collision_time - rotation_time
+            totals["collision"] += collision_time
+            totals["rotation"] += rotation_time
+            totals["blit"] += draw_done - update_done
+            frame_times.append(draw_done - start)
+            asteroids += len(game.asteroids)
+            bullets += len(game.bullets)
+
+        frames = max(1, len(frame_times))
+        frame_times.sort()
+        stage = {subsystem: totals[subsystem] * 1000 / frames for subsystem in SUBSYSTEMS}
+        stage["target"] = self.count
+        stage["asteroids"] = asteroids / frames
+        stage["bullets"] = bullets / frames
+        stage["frame_ms"] = sum(totals.values()) * 1000 / frames
+        stage["frame_p95_ms"] = percentile(frame_times, 0.95) * 1000 if frame_times else 0.0
+        return stage
+
+    def run(self):
+        game = self.game
+
+        # Time collisions and rotations in place while the test runs
+        game.check_collisions = PhaseTimer(game.check_collisions)
+        rotation_cache.rotate = PhaseTimer(rotation_cache.rotate)
+        try:
+            self.prepare()
+            print(f"{'target':>7} {'asteroids':>9} {'bullets':>8} " +
+                  " ".join(f"{name:>10}" for name in SUBSYSTEMS) + f" {'frame':>8} {'p95':>8}")
+            while self.count <= self.maximum and game.running:
+                stage = self.run_stage()
+                self.stages.append(stage)
+                print(f"{stage['target']:>7} {stage['asteroids']:>9.0f} {stage['bullets']:>8.0f} " +
+                      " ".join(f"{stage[name]:>10.3f}" for name in SUBSYSTEMS) +
+                      f" {stage['frame_ms']:>8.3f} {stage['frame_p95_ms']:>8.3f}")
+                if stage["frame_ms"] > FRAME_BUDGET_MS * self.stop_factor:
+                    break
+                self.count += self.step
+        finally:
+            del game.check_collisions
+            del rotation_cache.rotate
+        self.print_ceilings()
+        return self.stages
+
+    def print_ceilings(self):
+        if not self.stages:
+            return
+
+        def first_over(key):
+            return next((stage for stage in self.stages if stage[key] > FRAME_BUDGET_MS), None)
+
+        stage = first_over("frame_ms")
+        if stage is None:
+            print(f"Frame time stayed under {FRAME_BUDGET_MS:.1f} ms up to {self.stages[-1]['target']} asteroids")
+            return
+        shares = ", ".join(f"{name} {stage[name] / stage['frame_ms']:.0%}" for name in SUBSYSTEMS)
+        print(f"Frame time crossed {FRAME_BUDGET_MS:.1f} ms at {stage['asteroids']:.0f} asteroids "
+              f"and {stage['bullets']:.0f} bullets ({shares})")
+        for name in SUBSYSTEMS:
+            over = first_over(name)
+            if over is not None:
+                print(f"  {name} alone crossed it at {over['asteroids']:.0f} asteroids")
+            else:
+                peak = max(stage[name] for stage in self.stages)
+                print(f"  {name} stayed under it (peak {peak:.3f} ms)")
+
+
+def run_stress(game, **options):
+    """Run a stress test on game and return the per-stage results."""
+    return StressTest(game, **options).run()
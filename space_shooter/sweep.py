@@ -0,0 +1,205 @@
+"""Monte-Carlo difficulty sweep.
+
+Plays many headless games with a scripted or random pilot for every
+combination of the given difficulty knobs, spread over a process pool,
+and writes aggregated survival, score and per-level statistics as
+columnar tables:
+
+    python sweep.py --spawn-delay 2000,3000,4000 --shoot-cooldown 150,250 \\
+        --games 500 --pilot aim --output sweep.npz
+
+Each table is written as .npz (one array per column), .csv, or .parquet
+when pyarrow is installed. Per-level rows go to <output stem>.levels.<ext>.
+"""
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Run without opening a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only needed for .npz output
+    np = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pyarrow is optional; only needed for .parquet output
+    pyarrow = None
+
+from autopilot import PILOTS, make_pilot
+from space_shooter import FPS, PLAYING, Difficulty, Game
+from stats import percentile
+
+# Knob name, command-line flag and value type
+KNOBS = (
+    ("spawn_delay", "--spawn-delay", int),
+    ("initial_asteroids", "--initial-asteroids", int),
+    ("base_max_asteroids", "--base-max-asteroids", int),
+    ("asteroids_per_level", "--asteroids-per-level", int),
+    ("asteroid_speed_scale", "--asteroid-speed-scale", float),
+    ("shoot_cooldown", "--shoot-cooldown", int),
+    ("invulnerable_duration", "--invulnerable-duration", int),
+)
+
+# One game per worker process, fully reset for every run
+worker_game = None
+
+
+def play_game(task):
+    """Play one game and return its survival, score and per-level counts."""
+    global worker_game
+    knobs, pilot_name, seed, max_ticks = task
+    if worker_game is None:
+        worker_game = Game(headless=True)
+    game = worker_game
+    game.set_difficulty(Difficulty(**knobs))
+    game.reset(seed)
+    pilot = make_pilot(pilot_name, seed)
+
+    # Ticks spent and lives lost on each level
+    level_ticks = {}
+    level_deaths = {}
+    lives = game.player.lives
+    ticks = 0
+    while game.state == PLAYING and ticks < max_ticks:
+        level = game.level
+        game.step(inputs=pilot(game))
+        ticks += 1
+        level_ticks[level] = level_ticks.get(level, 0) + 1
+        if game.player.lives < lives:
+            level_deaths[level] = level_deaths.get(level, 0) + lives - game.player.lives
+            lives = game.player.lives
+
+    return {
+        "ticks": ticks,
+        "score": game.score,
+        "level": game.level,
+        "timed_out": game.state == PLAYING,
+        "level_ticks": level_ticks,
+        "level_deaths": level_deaths,
+    }
+
+
+def summarize(knobs, pilot_name, results, tick_ms):
+    """Return the summary row and per-level rows for one grid point."""
+    seconds = sorted(result["ticks"] * tick_ms / 1000 for result in results)
+    scores = sorted(result["score"] for result in results)
+    levels = [result["level"] for result in results]
+    games = len(results)
+
+    summary = dict(knobs)
+    summary.update({
+        "pilot": pilot_name,
+        "games": games,
+        "survival_mean_s": sum(seconds) / games,
+        "survival_p10_s": percentile(seconds, 0.1),
+        "survival_median_s": percentile(seconds, 0.5),
+        "survival_p90_s": percentile(seconds, 0.9),
+        "timeout_rate": sum(result["timed_out"] for result in results) / games,
+        "score_mean": sum(scores) / games,
+        "score_median": percentile(scores, 0.5),
+        "score_max": scores[-1],
+        "level_mean": sum(levels) / games,
+        "level_max": max(levels),
+    })
+
+    level_rows = []
+    for level in range(1, max(levels) + 1):
+        reached = [result for result in results if level in result["level_ticks"]]
+        if not reached:
+            continue
+        row = dict(knobs)
+        row.update({
+            "pilot": pilot_name,
+            "level": level,
+            "games_reached": len(reached),
+            "reach_rate": len(reached) / games,
+            "time_mean_s": sum(result["level_ticks"][level] for result in reached) * tick_ms / 1000 / len(reached),
+            "deaths_per_game": sum(result["level_deaths"].get(level, 0) for result in reached) / len(reached),
+            "cleared_rate": sum(result["level"] > level for result in reached) / len(reached),
+        })
+        level_rows.append(row)
+    return summary, level_rows
+
+
+def write_table(path, rows):
+    """Write rows (dicts with the same keys) column by column."""
+    columns = {name: [row[name] for row in rows] for name in rows[0]} if rows else {}
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npz":
+        if np is None:
+            raise ImportError(".npz output requires numpy")
+        np.savez_compressed(path, **{name: np.asarray(values) for name, values in columns.items()})
+    elif extension == ".parquet":
+        if pyarrow is None:
+            raise ImportError(".parquet output requires pyarrow")
+        pyarrow.parquet.write_table(pyarrow.table(columns), path)
+    elif extension == ".csv":
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(zip(*columns.values()))
+    else:
+        raise ValueError(f"Unsupported output format: {extension}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep difficulty knobs over many headless games.")
+    defaults = Difficulty()
+    for name, flag, kind in KNOBS:
+        parser.add_argument(flag, dest=name, default=str(getattr(defaults, name)),
+                            help=f"Comma-separated {kind.__name__} values (default {getattr(defaults, name)})")
+    parser.add_argument("--pilot", choices=sorted(PILOTS), default="aim", help="Who plays the games")
+    parser.add_argument("--games", type=int, default=100, help="Games per grid point")
+    parser.add_argument("--max-seconds", type=float, default=300,
+                        help="Game time after which a run is stopped as a timeout")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first game at each grid point")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--output", default="sweep.npz", help="Summary table (.npz, .csv or .parquet)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    tick_ms = 1000 / FPS
+    max_ticks = int(args.max_seconds * 1000 / tick_ms)
+
+    # Every combination of knob values
+    values = [[kind(value) for value in getattr(args, name).split(",")] for name, _, kind in KNOBS]
+    grid = [dict(zip((name for name, _, _ in KNOBS), combination)) for combination in itertools.product(*values)]
+    tasks = [(knobs, args.pilot, args.seed + game, max_ticks) for knobs in grid for game in range(args.games)]
+    print(f"{len(grid)} grid points x {args.games} games on {args.workers} workers")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        chunksize = max(1, len(tasks) // (args.workers * 16))
+        results = list(executor.map(play_game, tasks, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    summaries = []
+    level_rows = []
+    for index, knobs in enumerate(grid):
+        point = results[index * args.games:(index + 1) * args.games]
+        summary, levels = summarize(knobs, args.pilot, point, tick_ms)
+        summaries.append(summary)
+        level_rows.extend(levels)
+
+    stem, extension = os.path.splitext(args.output)
+    levels_path = f"{stem}.levels{extension}"
+    write_table(args.output, summaries)
+    write_table(levels_path, level_rows)
+
+    played = sum(result["ticks"] for result in results) * tick_ms / 1000
+    print(f"Played {len(tasks)} games ({played / 3600:.1f} h of game time) in {elapsed:.1f} s")
+    print(f"Wrote {args.output} and {levels_path}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,15 @@
+"""Wall-clock helpers shared by the measurement tools."""
+import time
+
+
+class PhaseTimer:
+    # Wraps a callable and accumulates the wall time spent in it
+    def __init__(self, func):
+        self.func = func
+        self.elapsed = 0.0
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        result = self.func(*args, **kwargs)
+        self.elapsed += time.perf_counter() - start
+        return result
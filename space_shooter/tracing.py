@@ -0,0 +1,187 @@
+"""Span tracing exported as Chrome trace-event JSON.
+
+Spans show what ran inside a frame and in which order, which totals and
+percentiles cannot. They are kept in a fixed-size ring buffer and saved
+as trace-event JSON that chrome://tracing and ui.perfetto.dev open:
+
+    with tracer.span("spawn_wave"):
+        ...
+
+    class Asteroid:
+        @traced()
+        def update(self, screen_width, screen_height):
+            ...
+
+Methods decorated inside a class body cost nothing while tracing is off:
+the decorator puts the plain function back on the class and only swaps a
+timing wrapper in while the tracer is running. Decorated module-level
+functions (Flask views, asset generators) keep a wrapper that checks one
+flag per call. Set SPACE_SHOOTER_TRACE=trace.json to trace the asset
+script or the web app; "{pid}" in the path is replaced by the process id
+so gunicorn workers do not overwrite each other.
+"""
+import atexit
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+
+# Spans kept before the oldest are overwritten
+DEFAULT_CAPACITY = 200_000
+
+TRACE_ENV = "SPACE_SHOOTER_TRACE"
+
+
+class NullSpan:
+    # Shared do-nothing span handed out while tracing is off
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+class Span:
+    def __init__(self, tracer, name, cat):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.record(self.name, self.cat, self.start, time.perf_counter_ns())
+        return False
+
+
+class Tracer:
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.enabled = False
+        self.events = [None] * capacity
+        self.counter = itertools.count()
+        self.epoch = time.perf_counter_ns()
+
+        # (owner, attribute, function, name, cat) for traced methods
+        self.methods = []
+
+    def span(self, name, cat="game"):
+        """Return a context manager that records name as one span."""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, cat)
+
+    def record(self, name, cat, start, end):
+        # next() on a count is atomic under the GIL, so threads never share a slot
+        self.events[next(self.counter) % self.capacity] = (name, cat, start, end - start, threading.get_ident())
+
+    def start(self):
+        if self.enabled:
+            return
+        for owner, attribute, func, name, cat in self.methods:
+            setattr(owner, attribute, timed(self, func, name, cat))
+        self.enabled = True
+
+    def stop(self):
+        if not self.enabled:
+            return
+        for owner, attribute, func, name, cat in self.methods:
+            setattr(owner, attribute, func)
+        self.enabled = False
+
+    def clear(self):
+        self.events = [None] * self.capacity
+        self.counter = itertools.count()
+
+    def recorded(self):
+        """Return the buffered spans, oldest first."""
+        return sorted((event for event in self.events if event is not None), key=lambda event: event[2])
+
+    def export(self):
+        """Return the buffered spans as a Chrome trace-event document."""
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                   "args": {"name": f"space_shooter ({pid})"}}]
+        for name, cat, start, duration, tid in self.recorded():
+            events.append({
+                "name": name, "cat": cat, "ph": "X", "pid": pid, "tid": tid,
+                "ts": (start - self.epoch) / 1000, "dur": duration / 1000,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save(self, path):
+        path = path.replace("{pid}", str(os.getpid()))
+        document = self.export()
+        with open(path, "w") as f:
+            json.dump(document, f, separators=(",", ":"))
+        print(f"Wrote {len(document['traceEvents']) - 1} spans to {path}")
+        return path
+
+
+tracer = Tracer()
+
+
+def timed(tracer, func, name, cat):
+    # Wrapper swapped onto a class while tracing is on
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            tracer.record(name, cat, start, time.perf_counter_ns())
+    return wrapper
+
+
+class TracedFunction:
+    def __init__(self, func, name, cat):
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.name = name or func.__qualname__
+        self.cat = cat
+
+    def __set_name__(self, owner, attribute):
+        # Defined in a class body: register, and time it only while the tracer runs
+        tracer.methods.append((owner, attribute, self.func, self.name, self.cat))
+        if tracer.enabled:
+            setattr(owner, attribute, timed(tracer, self.func, self.name, self.cat))
+        else:
+            setattr(owner, attribute, self.func)
+
+    def __call__(self, *args, **kwargs):
+        if not tracer.enabled:
+            return self.func(*args, **kwargs)
+        start = time.perf_counter_ns()
+        try:
+            return self.func(*args, **kwargs)
+        finally:
+            tracer.record(self.name, self.cat, start, time.perf_counter_ns())
+
+
+def traced(name=None, cat="game"):
+    """Decorator recording each call as a span named name (default: qualified name)."""
+    def decorate(func):
+        return TracedFunction(func, name, cat)
+    return decorate
+
+
+def trace_to(path):
+    """Start tracing and save the buffer to path when the process exits."""
+    tracer.start()
+    atexit.register(tracer.save, path)
+
+
+def trace_from_environment():
+    """Start tracing if SPACE_SHOOTER_TRACE names an output file."""
+    path = os.environ.get(TRACE_ENV)
+    if path:
+        trace_to(path)
+    return bool(path)